@@ -0,0 +1,118 @@
+import os
+import json
+import hashlib
+from array import array
+from collections import OrderedDict
+
+# Cache de resultados: a chave combina um identificador da instância com as
+# opções do resolvedor. O nível em memória é um LRU limitado; o nível em disco
+# (opcional) guarda cada resultado em um arquivo JSON no diretório informado e
+# sobrevive entre execuções.
+#
+# O identificador da instância pode ser o hash do conteúdo (instance_key, que
+# percorre a matriz inteira) ou uma chave já conhecida pelo chamador, como
+# caminho + data de modificação do arquivo (file_key) ou um id informado pelo
+# cliente, o que deixa a consulta independente de n.
+#
+# Os valores guardados são imutáveis (tuplas de números, textos e tuplas),
+# então get() devolve o próprio valor armazenado, sem cópia; quem precisar de
+# listas as reconstrói a partir dele.
+
+# Hash do conteúdo de uma matriz (ou de coordenadas), linha a linha em float64
+def instance_key(g):
+    digest = hashlib.blake2b(digest_size=16)
+    for row in g:
+        digest.update(array('d', row).tobytes())
+    return digest.hexdigest()
+
+# Identificador de uma instância lida de arquivo: caminho absoluto, tamanho e
+# data de modificação (em ns), sem ler o conteúdo
+def file_key(path):
+    st = os.stat(path)
+    return f"arquivo:{os.path.abspath(path)}:{st.st_size}:{st.st_mtime_ns}"
+
+# Converte listas (e tuplas aninhadas) em tuplas, recursivamente
+def _freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (int, float, str, bool)) or value is None:
+        return value
+    raise TypeError(f"valor não armazenável no cache: {type(value).__name__}")
+
+class ResultCache:
+    def __init__(self, maxsize=128, directory=None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    # Chave de um resultado: instância + opções (serializadas de forma estável)
+    def key(self, g, options=None, instance=None):
+        if instance is None:
+            instance = instance_key(g)
+        opts = json.dumps(options, sort_keys=True, default=str)
+        return hashlib.blake2b(f"{instance}:{opts}".encode(), digest_size=16).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    # Devolve o resultado armazenado (imutável), ou None. No disco só se lê
+    # JSON: um arquivo alterado no diretório não executa código, e um arquivo
+    # ilegível conta como erro de cache.
+    def get(self, key):
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+        if self.directory is not None and os.path.exists(self._path(key)):
+            try:
+                with open(self._path(key)) as f:
+                    value = _freeze(json.load(f))
+            except (ValueError, TypeError, OSError):
+                value = None
+            if value is not None:
+                self._remember(key, value)
+                self.disk_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    # Armazena um valor formado por listas/tuplas, números e textos
+    def put(self, key, value):
+        value = _freeze(value)
+        self._remember(key, value)
+
+        if self.directory is not None:
+            # Escrita atômica: outro processo nunca lê um arquivo pela metade
+            tmp = f"{self._path(key)}.{os.getpid()}.tmp"
+            with open(tmp, 'w') as f:
+                json.dump(value, f)
+            os.replace(tmp, self._path(key))
+
+    def _remember(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    # Métricas de acerto e erro
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            'size': len(self._entries),
+        }
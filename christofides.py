@@ -3,6 +3,18 @@ import heapq
 import networkx as nx
 from collections import defaultdict
 import time
+import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from melhoria import (
+    IMPROVEMENTS, improve_tour, lin_kernighan, neighbour_lists, coordinate_neighbour_lists,
+)
+from instancia import parse_tsplib, CoordinateMatrix
+from curva import space_filling_curve_tour
+from saida import OUTPUT_FORMATS, output_format, write_result
+from instrumentacao import SolverStats
+from memoria_compartilhada import InstanceRegistry, open_view
+from cache_resultados import ResultCache, file_key
 
 # Função para ler um grafo a partir de um arquivo.
 # Arquivo deve ter um padrão de: 
@@ -55,22 +67,31 @@ def read_graph(path):
     return g, n
 
 # Algoritmo de Prim para encontrar a Árvore Geradora Mínima (MST)
-def prim_mst(g, n):
+# Com `pi`, usa os pesos penalizados g[u][v] + pi[u] + pi[v] (limite de
+# Held-Karp); com `skip`, o vértice indicado fica fora da árvore. Com
+# `counters` (um dicionário), registra as inserções e remoções no heap.
+def prim_mst(g, n, pi=None, skip=None, counters=None):
     if n == 0:
         return [], 0.0
 
     in_mst = [False] * n
     parent = [-1] * n
     key = [float('inf')] * n
-    key[0] = 0
-    heap = [(0, 0)]
+    root = 0
+    if skip is not None:
+        in_mst[skip] = True
+        root = 1 if skip == 0 else 0
+    key[root] = 0
+    heap = [(0, root)]
 
     mst_edges = []
     total_weight = 0.0
+    pushes = pops = 0
 
     # Processa enquanto houver vértices no heap
     while heap:
         weight, u = heapq.heappop(heap)
+        pops += 1
 
         # Ignora se já estiver na MST
         if in_mst[u]:
@@ -83,15 +104,22 @@ def prim_mst(g, n):
         if parent[u] != -1:
             mst_edges.append((parent[u], u, {'weight': weight}))
 
+        row = g[u]
+        pu = 0.0 if pi is None else pi[u]
         for v in range(n):
             if u == v or in_mst[v]:
                 continue
 
-            if g[u][v] < key[v]:
+            w = row[v] if pi is None else row[v] + pu + pi[v]
+            if w < key[v]:
                 parent[v] = u
-                key[v] = g[u][v]
-                heapq.heappush(heap, (g[u][v], v))
+                key[v] = w
+                heapq.heappush(heap, (w, v))
+                pushes += 1
 
+    if counters is not None:
+        counters['heap_pushes'] = counters.get('heap_pushes', 0) + pushes + 1
+        counters['heap_pops'] = counters.get('heap_pops', 0) + pops
     return mst_edges, total_weight
 
 # Encontra vértices com grau ímpar na MST
@@ -114,7 +142,8 @@ def find_odd_vertices(mst_edges, n):
     return odd
 
 # Encontra o emparelhamento perfeito mínimo entre vértices ímpares
-def min_weight_perfect_matching(g, odd_vertices):
+# Com `counters`, registra o número de arestas candidatas consideradas.
+def min_weight_perfect_matching(g, odd_vertices, counters=None):
     if len(odd_vertices) == 0:
         return []
 
@@ -126,6 +155,8 @@ def min_weight_perfect_matching(g, odd_vertices):
             v = odd_vertices[j]
             # Usa peso negativo para obter o mínimo emparelhamento
             G.add_edge(u, v, weight=-g[u][v])
+    if counters is not None:
+        counters['matching_edges'] = counters.get('matching_edges', 0) + G.number_of_edges()
 
     # Executa o algoritmo de emparelhamento máximo (com pesos negativos)
     matching = nx.max_weight_matching(
@@ -150,6 +181,7 @@ def build_multigraph(mst_edges, matching_edges, n):
     return all_edges
 
 # Encontra um circuito euleriano no multigrafo nao-direcionado usando Hierholzer 
+# (mantida só como referência/API: o pipeline usa euler_shortcut_tour, em uma passada)
 def find_eulerian_tour(edges, n):
     graph = defaultdict(list)
     edge_count = defaultdict(int)
@@ -199,6 +231,7 @@ def find_eulerian_tour(edges, n):
     return tour[::-1]
 
 # Converte o circuito euleriano em ciclo hamiltoniano por atalhos
+# (mantida só como referência/API: o pipeline usa euler_shortcut_tour, em uma passada)
 def shortcut_eulerian_vertices(euler_tour):
     if not euler_tour:
         return []
@@ -229,79 +262,639 @@ def calculate_tour_cost(tour, g):
         cost += g[u][v]
     return cost
 
-# Algoritmo de Christofides para TSP
-def christofides(g, n):
-    if n <= 1:
-        return [], 0.0, [], 0.0
+# Heurística do vizinho mais próximo: ciclo construtivo rápido em O(n²). Com
+# `deadline` (instante de time.perf_counter), ao esgotar o prazo os vértices
+# ainda não visitados entram no ciclo na ordem original.
+def nearest_neighbour_tour(g, n, start=0, deadline=None):
+    if n == 0:
+        return [], 0.0
 
-    tempos = {}
+    visited = bytearray(n)
+    visited[start] = 1
+    tour = [start]
+    cost = 0.0
+    u = start
+
+    for _ in range(n - 1):
+        if deadline is not None and time.perf_counter() > deadline:
+            for v in range(n):
+                if not visited[v]:
+                    tour.append(v)
+                    cost += g[u][v]
+                    u = v
+            break
+        row = g[u]
+        best, best_w = -1, float('inf')
+        for v in range(n):
+            if not visited[v] and row[v] < best_w:
+                best, best_w = v, row[v]
+        visited[best] = 1
+        tour.append(best)
+        cost += best_w
+        u = best
+
+    # Fecha o ciclo retornando ao início
+    cost += g[u][start]
+    tour.append(start)
+    return tour, cost
+
+# Percorre o multigrafo com Hierholzer aplicando os atalhos durante a travessia.
+# Os vértices são emitidos na ordem em que o Hierholzer os finaliza (o circuito
+# invertido, que também é euleriano) e os repetidos são descartados na hora, de
+# modo que nem o circuito euleriano nem listas intermediárias são armazenados.
+# O custo do ciclo é acumulado incrementalmente.
+# Com `rng`, a ordem dos vizinhos de cada vértice é embaralhada, gerando outro
+# circuito euleriano (e portanto outro ciclo após os atalhos).
+# Com `counters`, registra as entradas de adjacência examinadas e os vértices
+# descartados pelos atalhos.
+def euler_shortcut_tour(edges, n, g, start=None, rng=None, counters=None):
+    if not edges:
+        return [], 0.0
+
+    # Lista de adjacência com o índice de cada aresta (suporta arestas paralelas)
+    adj = [[] for _ in range(n)]
+    for idx, (u, v) in enumerate(edges):
+        adj[u].append((v, idx))
+        adj[v].append((u, idx))
+
+    if rng is not None:
+        for nbrs in adj:
+            rng.shuffle(nbrs)
 
-    inicio = time.time()
-    mst_edges, mst_weight = prim_mst(g, n)
-    tempos['MST'] = time.time() - inicio
+    if start is None:
+        start = edges[0][0]
 
-    inicio = time.time()
+    used = bytearray(len(edges))
+    visited = bytearray(n)
+    stack = [start]
+    tour = []
+    cost = 0.0
+    last = -1
+    scans = skips = 0
+
+    while stack:
+        u = stack[-1]
+        nbrs = adj[u]
+
+        # Descarta arestas já percorridas a partir do outro extremo
+        while nbrs and used[nbrs[-1][1]]:
+            nbrs.pop()
+            scans += 1
+
+        if nbrs:
+            v, idx = nbrs.pop()
+            scans += 1
+            used[idx] = 1
+            stack.append(v)
+        else:
+            stack.pop()
+            # Atalho: só emite o vértice na primeira vez que é finalizado
+            if not visited[u]:
+                visited[u] = 1
+                if last != -1:
+                    cost += g[last][u]
+                tour.append(u)
+                last = u
+            else:
+                skips += 1
+
+    if counters is not None:
+        counters['euler_edge_scans'] = counters.get('euler_edge_scans', 0) + scans
+        counters['shortcut_skips'] = counters.get('shortcut_skips', 0) + skips
+
+    # Fecha o ciclo retornando ao início
+    cost += g[last][tour[0]]
+    tour.append(tour[0])
+    return tour, cost
+
+# Início de uma etapa (com `stats`, também marca o início da medição de memória)
+def _begin(stats):
+    return time.perf_counter_ns() if stats is None else stats.begin()
+
+# Registra uma etapa: tempo em segundos em `tempos` e, com `stats` (um
+# SolverStats), tempo em nanossegundos, contadores e memória
+def _record(tempos, stats, label, inicio, counters=None):
+    elapsed = time.perf_counter_ns() - inicio
+    tempos[label] = elapsed / 1e9
+    if stats is not None:
+        stats.record(label, elapsed, counters)
+
+# Etapas de Christofides até o multigrafo euleriano (MST + emparelhamento),
+# registrando os tempos de cada etapa em `tempos` (e em `stats`, se informado)
+def christofides_multigraph(g, n, tempos, stats=None):
+    counters = {}
+    inicio = _begin(stats)
+    mst_edges, mst_weight = prim_mst(g, n, counters=counters)
+    _record(tempos, stats, 'MST', inicio, counters)
+
+    inicio = _begin(stats)
     odd_vertices = find_odd_vertices(mst_edges, n)
-    tempos['Vértices Ímpares'] = time.time() - inicio
+    _record(tempos, stats, 'Vértices Ímpares', inicio, {'odd_vertices': len(odd_vertices)})
 
-    inicio = time.time()
-    matching_edges = min_weight_perfect_matching(g, odd_vertices)
-    tempos['Emparelhamento'] = time.time() - inicio
+    counters = {}
+    inicio = _begin(stats)
+    matching_edges = min_weight_perfect_matching(g, odd_vertices, counters=counters)
+    _record(tempos, stats, 'Emparelhamento', inicio, counters)
 
-    inicio = time.time()
+    inicio = _begin(stats)
     multigraph_edges = build_multigraph(mst_edges, matching_edges, n)
-    tempos['Multigrafo'] = time.time() - inicio
+    _record(tempos, stats, 'Multigrafo', inicio, {'multigraph_edges': len(multigraph_edges)})
+
+    return mst_edges, mst_weight, multigraph_edges
 
-    inicio = time.time()
-    euler_tour = find_eulerian_tour(multigraph_edges, n)
-    tempos['Circuito Euleriano'] = time.time() - inicio
+# Algoritmo de Christofides para TSP
+# Com `cache` (um ResultCache), o resultado é consultado antes de qualquer
+# etapa; em um acerto, os tempos trazem apenas a consulta ('Cache').
+# `instance` é o identificador da instância no cache (por exemplo, file_key do
+# arquivo); sem ele, a chave é o hash da matriz inteira.
+# Com `stats` (um SolverStats), registra o tempo em nanossegundos e os
+# contadores de cada etapa. Com `profile=True` (ou um prefixo de arquivo),
+# executa cada etapa sob o cProfile, grava <prefixo>.pstats e
+# <prefixo>.collapsed (padrão: "christofides") e imprime na saída de erro as
+# funções mais custosas de cada etapa.
+def christofides(g, n, cache=None, stats=None, profile=False, instance=None):
+    if n <= 1:
+        return [], 0.0, [0, 0] if n == 1 else [], 0.0, {}
+
+    if profile:
+        from perfil import save_profile, print_hot_functions
+
+        stats = stats if stats is not None else SolverStats()
+        stats.profile = True
+        result = christofides(g, n, cache=cache, stats=stats, instance=instance)
+        prefix = profile if isinstance(profile, str) else 'christofides'
+        save_profile(stats.profiles, prefix)
+        print_hot_functions(stats.profiles, out=sys.stderr)
+        return result
+
+    if cache is not None:
+        inicio = _begin(stats)
+        key = cache.key(g, {'engine': 'christofides'}, instance=instance)
+        result = cache.get(key)
+        if result is not None:
+            mst, mst_weight, tour, cost = result
+            tempos = {}
+            _record(tempos, stats, 'Cache', inicio, {'hits': 1})
+            return [(u, v, {'weight': w}) for u, v, w in mst], mst_weight, list(tour), cost, tempos
 
-    inicio = time.time()
-    hamiltonian_tour = shortcut_eulerian_vertices(euler_tour)
-    tempos['Atalhos'] = time.time() - inicio
+    tempos = {}
 
-    inicio = time.time()
-    tour_cost = calculate_tour_cost(hamiltonian_tour, g)
-    tempos['Cálculo Custo'] = time.time() - inicio
+    mst_edges, mst_weight, multigraph_edges = christofides_multigraph(g, n, tempos, stats)
 
+    counters = {}
+    inicio = _begin(stats)
+    hamiltonian_tour, tour_cost = euler_shortcut_tour(
+        multigraph_edges, n, g, counters=counters
+    )
+    _record(tempos, stats, 'Circuito Euleriano + Atalhos', inicio, counters)
+
+    if cache is not None:
+        mst = [(u, v, d['weight']) for u, v, d in mst_edges]
+        cache.put(key, (mst, mst_weight, hamiltonian_tour, tour_cost))
     return mst_edges, mst_weight, hamiltonian_tour, tour_cost, tempos
 
+# Estado de cada processo do pool de multi-início (o multigrafo é enviado uma
+# única vez por processo pelo inicializador e a matriz é lida da memória
+# compartilhada, sem cópia)
+_multistart_state = {}
+
+def _init_multistart_worker(edges, handle):
+    shm, _, g = open_view(handle)
+    _multistart_state['shm'] = shm
+    _multistart_state['edges'] = edges
+    _multistart_state['n'] = handle.rows
+    _multistart_state['g'] = g
+
+def _run_multistart_trials(trials):
+    edges = _multistart_state['edges']
+    n = _multistart_state['n']
+    g = _multistart_state['g']
+    return _best_of_trials(edges, n, g, trials)
+
+# Executa as tentativas (vértice inicial, semente) e devolve o melhor ciclo
+def _best_of_trials(edges, n, g, trials):
+    best_tour, best_cost = None, float('inf')
+    for start, seed in trials:
+        rng = random.Random(seed) if seed is not None else None
+        tour, cost = euler_shortcut_tour(edges, n, g, start=start, rng=rng)
+        if cost < best_cost:
+            best_tour, best_cost = tour, cost
+    return best_tour, best_cost
+
+# Christofides com múltiplos inícios: a MST e o emparelhamento são calculados
+# uma única vez e várias combinações de vértice inicial e ordem de vizinhos do
+# Hierholzer são exploradas, devolvendo o melhor ciclo. A primeira tentativa é
+# sempre a de `christofides()`, então o resultado nunca é pior. Com workers > 1
+# as tentativas são distribuídas em um pool de processos.
+def christofides_multistart(g, n, starts=16, workers=1, seed=0, stats=None):
+    if n <= 1:
+        return [], 0.0, [0, 0] if n == 1 else [], 0.0, {}
+
+    tempos = {}
+
+    mst_edges, mst_weight, multigraph_edges = christofides_multigraph(g, n, tempos, stats)
+
+    inicio = _begin(stats)
+    step = max(1, n // starts)
+    trials = [(None, None)]
+    for i in range(1, starts):
+        trials.append(((i * step) % n, seed + i))
+
+    if workers > 1 and len(trials) > 1:
+        chunks = [trials[i::workers] for i in range(workers)]
+        chunks = [c for c in chunks if c]
+        with InstanceRegistry() as registry:
+            handle = registry.acquire('g', g)
+            with ProcessPoolExecutor(
+                max_workers=len(chunks),
+                initializer=_init_multistart_worker,
+                initargs=(multigraph_edges, handle),
+            ) as pool:
+                results = list(pool.map(_run_multistart_trials, chunks))
+        hamiltonian_tour, tour_cost = min(results, key=lambda r: r[1])
+    else:
+        hamiltonian_tour, tour_cost = _best_of_trials(multigraph_edges, n, g, trials)
+    _record(tempos, stats, 'Multi-início (Euler + Atalhos)', inicio, {'trials': len(trials)})
+
+    return mst_edges, mst_weight, hamiltonian_tour, tour_cost, tempos
+
+# Sub-instância usada para estimar o tempo de christofides() e prazo mínimo
+# para medi-la (abaixo dele, a estimativa já não caberia no prazo)
+_CALIBRATION_SIZE = 80
+_MIN_CALIBRATION_BUDGET = 0.1
+
+# Estimativa conservadora do tempo de christofides(): mede a execução em uma
+# sub-instância de até _CALIBRATION_SIZE vértices amostrados e extrapola
+# cubicamente (o emparelhamento domina e cresce perto de n³)
+def _estimate_christofides(g, n):
+    m = min(n // 2, _CALIBRATION_SIZE)
+    if m < 4:
+        return 0.0
+    sample = sorted(random.Random(0).sample(range(n), m))
+    sub = [[g[u][v] for v in sample] for u in sample]
+    inicio = time.perf_counter()
+    christofides(sub, m)
+    return (time.perf_counter() - inicio) * (n / m) ** 3
+
+# Resolução com prazo (em segundos): sempre devolve o melhor ciclo encontrado
+# dentro do prazo. Começa pelo vizinho mais próximo (interrompido no prazo, se
+# preciso), executa Christofides completo se a estimativa de tempo, medida em
+# uma sub-instância, couber no que resta e usa o tempo restante em busca local
+# (Lin-Kernighan). Com as coordenadas (`coords`), o ciclo inicial vem da curva
+# de Hilbert, em O(n log n), e as listas de vizinhos da busca local vêm de uma
+# grade espacial. As listas de vizinhos usam no máximo metade do que resta;
+# os vértices sem lista não iniciam movimentos. Devolve (ciclo, custo, etapas
+# concluídas com seus tempos).
+def solve(g, n, deadline=None, coords=None):
+    limite = None if deadline is None else time.perf_counter() + deadline
+
+    def restante():
+        return float('inf') if limite is None else limite - time.perf_counter()
+
+    etapas = {}
+    if n == 0:
+        return [], 0.0, etapas
+
+    inicio = time.perf_counter()
+    if coords is not None:
+        tour, cost = space_filling_curve_tour(coords)
+        etapas['Curva de Hilbert'] = time.perf_counter() - inicio
+    else:
+        tour, cost = nearest_neighbour_tour(g, n, deadline=limite)
+        etapa = 'Vizinho Mais Próximo' if restante() > 0 else 'Vizinho Mais Próximo (interrompido)'
+        etapas[etapa] = time.perf_counter() - inicio
+
+    if n <= 3:
+        return tour, cost, etapas
+
+    if limite is None or (restante() > _MIN_CALIBRATION_BUDGET
+                          and restante() > _estimate_christofides(g, n)):
+        inicio = time.perf_counter()
+        _, _, c_tour, c_cost, _ = christofides(g, n)
+        etapas['Christofides'] = time.perf_counter() - inicio
+        if c_cost < cost:
+            tour, cost = c_tour, c_cost
+
+    if restante() > 0:
+        inicio = time.perf_counter()
+        prazo_listas = None if limite is None else time.perf_counter() + restante() / 2
+        if coords is not None:
+            neighbours = coordinate_neighbour_lists(coords, 8, deadline=prazo_listas)
+        else:
+            neighbours = neighbour_lists(g, n, 8, deadline=prazo_listas)
+        time_limit = None if limite is None else max(0.0, restante())
+        tour, cost = lin_kernighan(tour, g, cost=cost, neighbours=neighbours,
+                                   time_limit=time_limit)
+        etapa = 'Melhoria (lk)' if restante() > 0 else 'Melhoria (lk, interrompida)'
+        etapas[etapa] = time.perf_counter() - inicio
+
+    return tour, cost, etapas
+
+# Construções de ciclo disponíveis na linha de comando
+ENGINES = {
+    'christofides': 'Christofides',
+    'sfc': 'Curva de Hilbert',
+    'decomp': 'Decomposição Espacial',
+}
+
 # Ponto de entrada do programa
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Uso: python christofides.py <graph.txt>")
-        sys.exit(1)
+    # Modo serviço: python christofides.py serve [--port ...]
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        from servico import main as serve_main
+        serve_main(sys.argv[2:])
+        sys.exit(0)
+
+    # Suíte de desempenho: python christofides.py bench [--baseline ...]
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        from desempenho import main as bench_main
+        sys.exit(bench_main(sys.argv[2:]))
+
+    # Benchmark de escala: python christofides.py scaling [--engines ...]
+    if len(sys.argv) > 1 and sys.argv[1] == 'scaling':
+        from escala import main as scaling_main
+        sys.exit(scaling_main(sys.argv[2:]))
+
+    # Comparação com o networkx: python christofides.py compare [--instances ...]
+    if len(sys.argv) > 1 and sys.argv[1] == 'compare':
+        from comparacao import main as compare_main
+        sys.exit(compare_main(sys.argv[2:]))
+
+    parser = argparse.ArgumentParser(
+        description="Aproximação do TSP pelo algoritmo de Christofides"
+    )
+    parser.add_argument("arquivo", nargs="?",
+                        help="arquivo com a matriz de adjacência (ou coordenadas TSPLIB, com --engine sfc/decomp)")
+    parser.add_argument("--engine", choices=ENGINES, default='christofides',
+                        help="construção do ciclo: christofides (matriz), sfc (curva de "
+                             "Hilbert) ou decomp (decomposição espacial) (padrão: christofides)")
+    parser.add_argument("--sparse", action="store_true",
+                        help="o arquivo é uma lista de arestas (n na primeira linha, depois "
+                             "'u v peso'); as distâncias são os caminhos mínimos, calculados sob demanda")
+    parser.add_argument("--triangle-audit", action="store_true",
+                        help="amostra trios da matriz e informa a taxa de violação da "
+                             "desigualdade triangular")
+    parser.add_argument("--repair-triangle", action="store_true",
+                        help="audita a matriz e, havendo violações, substitui as distâncias "
+                             "pelos caminhos mínimos (Floyd–Warshall em blocos) antes de resolver")
+    parser.add_argument("--audit-samples", type=int, default=20000,
+                        help="trios amostrados na auditoria (padrão: 20000)")
+    parser.add_argument("--worker", action="store_true",
+                        help="lê jobs em JSON lines da entrada padrão e escreve os resultados na saída")
+    parser.add_argument("--starts", type=int, default=1,
+                        help="número de inícios do circuito euleriano (padrão: 1)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processos usados no multi-início e no reparo da "
+                             "desigualdade triangular (padrão: 1)")
+    parser.add_argument("--improve", choices=sorted(IMPROVEMENTS),
+                        help="busca local aplicada ao ciclo de Christofides")
+    parser.add_argument("--bound-iterations", type=int, default=50,
+                        help="iterações do limite inferior de Held-Karp (0 desliga; "
+                             "não é calculado com --deadline)")
+    parser.add_argument("--deadline", type=float,
+                        help="prazo em segundos: devolve o melhor ciclo encontrado nele")
+    parser.add_argument("--cache-dir",
+                        help="diretório do cache de resultados em disco")
+    parser.add_argument("--time-limit", type=float,
+                        help="limite de tempo da melhoria lk, em segundos")
+    parser.add_argument("--output",
+                        help="grava o ciclo em arquivo (.jsonl, .tour TSPLIB ou .bin)")
+    parser.add_argument("--output-format", choices=OUTPUT_FORMATS,
+                        help="formato de --output (padrão: deduzido pela extensão)")
+    parser.add_argument("--no-mst", action="store_true",
+                        help="não imprime as arestas da árvore geradora mínima")
+    parser.add_argument("--quiet", action="store_true",
+                        help="não imprime a árvore nem o ciclo, apenas custos e tempos")
+    parser.add_argument("--stats", metavar="ARQUIVO",
+                        help="grava as estatísticas por etapa (tempo em ns e contadores) "
+                             "em JSON ('-' para a saída padrão)")
+    parser.add_argument("--profile", nargs="?", const="perfil", metavar="PREFIXO",
+                        help="executa cada etapa sob o cProfile e grava PREFIXO.pstats e "
+                             "PREFIXO.collapsed (padrão: perfil)")
+    parser.add_argument("--memprofile", action="store_true",
+                        help="mede a memória de cada etapa (pico e saldo do tracemalloc, "
+                             "pico de RSS do processo)")
+    args = parser.parse_args()
+    if args.worker:
+        from servico import worker_loop
+        worker_loop(cache=ResultCache(directory=args.cache_dir))
+        sys.exit(0)
+    if args.arquivo is None:
+        parser.error("informe o arquivo com a matriz de adjacência")
+    if args.time_limit is not None and args.improve != 'lk':
+        parser.error("--time-limit só se aplica a --improve lk")
+    if args.deadline is not None and (args.improve or args.starts > 1):
+        parser.error("--deadline já inclui a busca local e não combina com --improve/--starts")
+    if args.sparse and (args.engine != 'christofides' or args.starts > 1
+                        or args.cache_dir or args.deadline is not None):
+        parser.error("--sparse não combina com --engine, --starts, --cache-dir ou --deadline")
+    if args.engine != 'christofides' and (args.starts > 1 or args.cache_dir):
+        parser.error("--starts e --cache-dir só se aplicam a --engine christofides")
+    if (args.triangle_audit or args.repair_triangle) and (args.sparse or args.engine != 'christofides'):
+        parser.error("--triangle-audit e --repair-triangle só se aplicam à matriz de adjacência")
+    if args.engine == 'decomp' and args.deadline is not None:
+        parser.error("--deadline não se aplica a --engine decomp")
+    if args.output is not None and args.output_format is None:
+        try:
+            args.output_format = output_format(args.output)
+        except ValueError as e:
+            parser.error(str(e))
 
     try:
         inicio_total = time.time()
 
+        stats = None
+        if args.stats is not None or args.memprofile or args.profile:
+            stats = SolverStats(memory=args.memprofile, profile=args.profile is not None)
         inicio_leitura = time.time()
-        graph, n = read_graph(sys.argv[1])
+        inicio_ns = _begin(stats)
+        coords = None
+        closure = None
+        if args.sparse:
+            from grafo_esparso import read_edge_list, MetricClosure, christofides_sparse
+
+            adj, n = read_edge_list(args.arquivo)
+            closure = MetricClosure(adj, n)
+            graph = closure.point
+        elif args.engine == 'christofides':
+            graph, n = read_graph(args.arquivo)
+        else:
+            # Coordenadas: distâncias calculadas sob demanda, sem matriz n×n
+            coords = parse_tsplib(args.arquivo)
+            if not coords:
+                raise ValueError("nenhuma coordenada encontrada no arquivo")
+            graph, n = CoordinateMatrix(coords), len(coords)
         tempo_leitura = time.time() - inicio_leitura
+        if stats is not None:
+            stats.record('Leitura', time.perf_counter_ns() - inicio_ns, {'n': n})
+
+        # Pré-processamento: a garantia de 1,5 depende da desigualdade triangular
+        tempos_preparo = {}
+        auditoria = None
+        reparadas = None
+        if args.triangle_audit or args.repair_triangle:
+            from fechamento_metrico import triangle_audit, metric_closure
+
+            inicio_ns = _begin(stats)
+            auditoria = triangle_audit(graph, n, samples=args.audit_samples)
+            _record(tempos_preparo, stats, 'Auditoria Triangular', inicio_ns,
+                    {'amostras': auditoria['amostras'], 'violacoes': auditoria['violacoes']})
+            if args.repair_triangle and auditoria['violacoes'] > 0:
+                inicio_ns = _begin(stats)
+                graph, reparadas = metric_closure(graph, n, workers=args.workers)
+                _record(tempos_preparo, stats, 'Fechamento Métrico', inicio_ns,
+                        {'entradas_reduzidas': reparadas})
 
         inicio_algoritmo = time.time()
-        mst_edges, mst_weight, tour, total, tempos_etapas = christofides(graph, n)
+        mst_edges = None
+        metodo = ENGINES[args.engine]
+        cache = None if args.cache_dir is None else ResultCache(directory=args.cache_dir)
+        if args.deadline is not None:
+            tour, total, tempos_etapas = solve(graph, n, deadline=args.deadline, coords=coords)
+            # O ciclo vem das etapas que couberam no prazo, não só do Christofides
+            metodo = " + ".join(tempos_etapas)
+        elif args.engine == 'sfc':
+            inicio = time.time()
+            tour, total = space_filling_curve_tour(coords)
+            tempos_etapas = {'Curva de Hilbert': time.time() - inicio}
+        elif args.engine == 'decomp':
+            from decomposicao import solve_decomposed
+            tour, total, tempos_etapas = solve_decomposed(coords, workers=args.workers)
+        elif closure is not None:
+            mst_edges, mst_weight, tour, total, tempos_etapas = christofides_sparse(
+                closure, stats=stats
+            )
+        elif args.starts > 1:
+            mst_edges, mst_weight, tour, total, tempos_etapas = christofides_multistart(
+                graph, n, starts=args.starts, workers=args.workers, stats=stats
+            )
+        else:
+            # Matriz reparada pelo fechamento métrico: a chave é o conteúdo
+            instancia = None if reparadas is not None else file_key(args.arquivo)
+            mst_edges, mst_weight, tour, total, tempos_etapas = christofides(
+                graph, n, cache=cache, stats=stats, instance=instancia
+            )
+
+        if args.improve and n > 1:
+            inicio = time.time()
+            inicio_ns = _begin(stats)
+            opcoes = {} if args.time_limit is None else {'time_limit': args.time_limit}
+            if coords is not None:
+                opcoes['neighbours'] = coordinate_neighbour_lists(coords)
+            elif closure is not None:
+                opcoes['neighbours'] = closure.neighbour_lists()
+            tour, total = improve_tour(tour, total, graph, args.improve, **opcoes)
+            tempos_etapas[f'Melhoria ({args.improve})'] = time.time() - inicio
+            if stats is not None:
+                stats.record(f'Melhoria ({args.improve})', time.perf_counter_ns() - inicio_ns)
         tempo_algoritmo = time.time() - inicio_algoritmo
 
+        if stats is not None:
+            # Etapas sem instrumentação própria (outras construções, melhoria)
+            for etapa, t in tempos_etapas.items():
+                if etapa not in stats:
+                    stats.record(etapa, int(t * 1e9))
+
+        limite = None
+        # O limite de Held-Karp é O(n²) por iteração: só com a matriz, e nunca
+        # com --deadline, que ficaria estourado por uma etapa fora do prazo
+        if (args.bound_iterations > 0 and n > 2 and coords is None and closure is None
+                and args.deadline is None):
+            from limite_inferior import held_karp_bound, optimality_gap
+
+            inicio_limite = time.time()
+            limite, _, _ = held_karp_bound(
+                graph, n, upper_bound=total, max_iterations=args.bound_iterations
+            )
+            tempo_limite = time.time() - inicio_limite
+
+        tempo_saida = None
+        if args.output is not None:
+            inicio_saida = time.time()
+            write_result(args.output, tour, total, fmt=args.output_format,
+                         name=args.arquivo, tempos=tempos_etapas)
+            tempo_saida = time.time() - inicio_saida
+
         tempo_total = time.time() - inicio_total
 
         # Saída formatada
-        print("Árvore Geradora Mínima:")
-        print(mst_edges)
-        print(f"Peso da árvore geradora mínima: {mst_weight}")
+        if mst_edges is not None:
+            if not (args.quiet or args.no_mst):
+                print("Árvore Geradora Mínima:")
+                print(mst_edges)
+            print(f"Peso da árvore geradora mínima: {mst_weight}")
+        elif args.deadline is not None:
+            print(f"Etapas concluídas no prazo: {', '.join(tempos_etapas)}")
+        else:
+            print(f"Etapas executadas: {', '.join(tempos_etapas)}")
 
-        print("\nSolução Aproximada Encontrada por Christofides:")
-        print(tour)
+        if not args.quiet:
+            print(f"\nSolução Aproximada Encontrada por {metodo}:")
+            print(tour)
+        else:
+            print(f"\nSolução Aproximada Encontrada por {metodo} ({n} vértices)")
         print(f"Peso da Solução: {total}")
+        if limite is not None:
+            print(f"Limite inferior (Held-Karp): {limite:.1f}")
+            print(f"Gap certificado: {100 * optimality_gap(total, limite):.2f}%")
+        if auditoria is not None:
+            print(f"Desigualdade triangular: {auditoria['violacoes']} violação(ões) em "
+                  f"{auditoria['amostras']} trios amostrados ({100 * auditoria['taxa']:.3f}%), "
+                  f"maior excesso {auditoria['maior_excesso']:.3f}")
+            if reparadas is not None:
+                print(f"Matriz reparada pelo fechamento métrico: {reparadas} entrada(s) reduzida(s)")
+            elif auditoria['violacoes'] > 0:
+                print("Aviso: a garantia de 1,5 do ótimo não vale para esta matriz "
+                      "(use --repair-triangle)")
 
 
         # Relatório de tempos
         print("\nTempos de Execução:")
         print(f"- Leitura do arquivo: {tempo_leitura:.6f} segundos")
+        for etapa, t in tempos_preparo.items():
+            print(f"- {etapa}: {t:.6f} segundos")
         for etapa, t in tempos_etapas.items():
             print(f"- {etapa}: {t:.6f} segundos")
         print(f"- Algoritmo Christofides: {tempo_algoritmo:.6f} segundos")
+        if limite is not None:
+            print(f"- Limite inferior: {tempo_limite:.6f} segundos")
+        if tempo_saida is not None:
+            print(f"- Escrita de {args.output}: {tempo_saida:.6f} segundos")
         print(f"- Tempo total (com leitura): {tempo_total:.6f} segundos")
+        if cache is not None:
+            cache_stats = cache.stats()
+            print(f"\nCache de resultados: {cache_stats['hits'] + cache_stats['disk_hits']} acerto(s), "
+                  f"{cache_stats['misses']} erro(s)")
+        if closure is not None:
+            cs = closure.stats()
+            print(f"\nFechamento métrico: {cs['linhas_calculadas']} linha(s) e "
+                  f"{cs['pares_calculados']} par(es) calculados por Dijkstra")
+
+        if args.memprofile:
+            print("\nMemória por etapa (pico e saldo do tracemalloc, pico de RSS):")
+            for etapa, dados in stats.stages.items():
+                mem = dados.get('memoria')
+                if mem is None:
+                    continue
+                rss = "" if mem['rss_pico_kb'] is None else f", RSS {mem['rss_pico_kb'] / 1024:.1f} MiB"
+                print(f"- {etapa}: pico {mem['pico_bytes'] / 2**20:.2f} MiB, "
+                      f"saldo {mem['saldo_bytes'] / 2**20:+.2f} MiB{rss}")
+
+        if args.profile is not None:
+            from perfil import save_profile, print_hot_functions
+
+            print_hot_functions(stats.profiles)
+            arquivos = save_profile(stats.profiles, args.profile)
+            if arquivos:
+                print(f"Perfil gravado em: {', '.join(arquivos)}")
+
+        if args.stats is not None:
+            if args.stats == '-':
+                print("\nEstatísticas por etapa:")
+                print(stats.to_json())
+            else:
+                with open(args.stats, 'w') as f:
+                    f.write(stats.to_json() + "\n")
 
     except Exception as e:
         print(f"Erro: {e}", file=sys.stderr)
@@ -0,0 +1,124 @@
+import sys
+import json
+import time
+import argparse
+
+import networkx as nx
+from networkx.algorithms import approximation as nx_app
+
+from christofides import christofides, calculate_tour_cost
+from instrumentacao import peak_memory
+from melhoria import improve_tour
+from instancia import gerar_matriz
+from desempenho import BENCH_INSTANCES, OPTIMA, load_instance
+
+# Comparação com as aproximações do TSP do networkx (python christofides.py
+# compare): o pipeline deste repositório e as funções do networkx resolvem as
+# mesmas instâncias, e são informados lado a lado o tempo, o pico de memória e
+# o custo do ciclo. O grafo do networkx é montado a partir da matriz fora da
+# região medida, de modo que só o algoritmo entra no tempo e na memória.
+
+# Método: função (g, n, G) -> ciclo fechado. `G` é o nx.Graph completo.
+def _ours(improve=None):
+    def run(g, n, G):
+        _, _, tour, cost, _ = christofides(g, n)
+        if improve:
+            tour, cost = improve_tour(tour, cost, g, improve)
+        return tour
+    return run
+
+METHODS = {
+    'christofides': _ours(),
+    'christofides+2opt+oropt': _ours('2opt+oropt'),
+    'christofides+lk': _ours('lk'),
+    'nx.christofides': lambda g, n, G: nx_app.christofides(G),
+    'nx.greedy_tsp': lambda g, n, G: nx_app.greedy_tsp(G, source=0),
+    'nx.simulated_annealing_tsp': lambda g, n, G: nx_app.simulated_annealing_tsp(
+        G, 'greedy', source=0, seed=0),
+    'nx.threshold_accepting_tsp': lambda g, n, G: nx_app.threshold_accepting_tsp(
+        G, 'greedy', source=0, seed=0),
+}
+
+DEFAULT_INSTANCES = [name for name, (_, kind) in BENCH_INSTANCES.items() if kind == 'matriz']
+
+# Grafo completo do networkx com os pesos da matriz
+def to_nx_graph(g, n):
+    G = nx.Graph()
+    G.add_nodes_from(range(n))
+    G.add_weighted_edges_from(
+        (u, v, g[u][v]) for u in range(n) for v in range(u + 1, n)
+    )
+    return G
+
+# Executa um método e devolve (ciclo, tempo em segundos)
+def timed(method, g, n, G):
+    inicio = time.perf_counter()
+    tour = METHODS[method](g, n, G)
+    return tour, time.perf_counter() - inicio
+
+def _check_tour(tour, n):
+    if len(tour) != n + 1 or tour[0] != tour[-1] or sorted(tour[:-1]) != list(range(n)):
+        raise RuntimeError("ciclo inválido")
+
+def compare_methods(instances=None, methods=None, memory=True, out=sys.stdout):
+    instances = instances or DEFAULT_INSTANCES
+    methods = methods or list(METHODS)
+    results = []
+
+    print(f"{'Instância':<9} {'Método':<28} {'Custo':>12} {'Gap':>8} "
+          f"{'Tempo':>10} {'Memória':>11}", file=out)
+    for name in instances:
+        g, coords, n = load_instance(name)
+        if g is None:
+            g = gerar_matriz(coords)
+        # Fora da região medida
+        G = to_nx_graph(g, n)
+
+        for method in methods:
+            tour, tempo = timed(method, g, n, G)
+            _check_tour(tour, n)
+            cost = calculate_tour_cost(tour, g)
+            peak = peak_memory(METHODS[method], g, n, G) if memory else None
+
+            optimum = OPTIMA.get(name)
+            gap = None if optimum is None else cost / optimum - 1
+            results.append({
+                'instancia': name, 'metodo': method, 'n': n, 'custo': cost,
+                'gap': gap, 'tempo': tempo, 'memoria_pico_bytes': peak,
+            })
+
+            gap_txt = "" if gap is None else f"{100 * gap:.2f}%"
+            mem_txt = "" if peak is None else f"{peak / 2**20:.2f} MiB"
+            print(f"{name:<9} {method:<28} {cost:>12.1f} {gap_txt:>8} "
+                  f"{tempo:>9.4f}s {mem_txt:>11}", file=out)
+            out.flush()
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="christofides.py compare",
+        description="Compara o pipeline do repositório com as aproximações do networkx",
+    )
+    parser.add_argument("--instances", nargs="+", choices=list(BENCH_INSTANCES),
+                        help="instâncias (padrão: todas as matrizes do repositório)")
+    parser.add_argument("--methods", nargs="+", choices=list(METHODS),
+                        help="métodos comparados (padrão: todos)")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="não mede o pico de memória (evita a execução extra)")
+    parser.add_argument("--save", metavar="ARQUIVO",
+                        help="grava os resultados em JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        results = compare_methods(args.instances, args.methods, memory=not args.no_memory)
+        if args.save is not None:
+            with open(args.save, 'w') as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
+                f.write("\n")
+        return 0
+    except Exception as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,119 @@
+import sys
+import math
+import time
+from array import array
+from itertools import repeat
+
+from instancia import parse_tsplib
+
+# Construção do ciclo por curva de preenchimento do espaço: as coordenadas são
+# levadas a uma grade 2^16 × 2^16, cada ponto recebe o seu índice na curva de
+# Hilbert (ou de Morton) e o ciclo visita os pontos nessa ordem. Custa uma
+# ordenação, O(n log n), e serve como resposta instantânea para instâncias
+# grandes ou como ponto de partida da busca local.
+
+CURVES = ('hilbert', 'morton')
+
+_ORDER = 16
+_SIDE = (1 << _ORDER) - 1
+
+# Morton: espalha os 8 bits de um byte nas posições pares de 16 bits
+_SPREAD = array('I', (
+    sum(((b >> i) & 1) << (2 * i) for i in range(8)) for b in range(256)
+))
+
+def _morton_index(x, y):
+    s = _SPREAD
+    return ((s[x & 255] | s[x >> 8] << 16)
+            | (s[y & 255] | s[y >> 8] << 16) << 1)
+
+# Hilbert: autômato que consome 4 bits de x e 4 de y por passo. O estado é a
+# transformação acumulada do quadrante (troca de eixos, complemento), e cada
+# entrada da tabela dá os 8 bits do índice e o próximo estado.
+def _hilbert_tables():
+    digits = array('B', bytes(4 * 256))
+    states = array('B', bytes(4 * 256))
+    for state in range(4):
+        swap, flip = state & 1, state >> 1
+        for cx in range(16):
+            for cy in range(16):
+                x, y = (15 - cx, 15 - cy) if flip else (cx, cy)
+                if swap:
+                    x, y = y, x
+                d, sw, fl = 0, swap, flip
+                s = 8
+                while s:
+                    rx = 1 if x & s else 0
+                    ry = 1 if y & s else 0
+                    d += s * s * ((3 * rx) ^ ry)
+                    if ry == 0:
+                        if rx == 1:
+                            x, y = 15 - x, 15 - y
+                            fl ^= 1
+                        x, y = y, x
+                        sw ^= 1
+                    s >>= 1
+                entry = state * 256 + (cx << 4 | cy)
+                digits[entry] = d
+                states[entry] = sw | fl << 1
+    return digits, states
+
+_HILBERT_DIGITS, _HILBERT_STATES = _hilbert_tables()
+
+def _hilbert_index(x, y):
+    digits, states = _HILBERT_DIGITS, _HILBERT_STATES
+    d = state = 0
+    for shift in (12, 8, 4, 0):
+        entry = state * 256 + ((x >> shift & 15) << 4 | (y >> shift & 15))
+        d = d << 8 | digits[entry]
+        state = states[entry]
+    return d
+
+# Ordem dos pontos ao longo da curva
+def curve_order(coords, curve='hilbert'):
+    if curve not in CURVES:
+        raise ValueError(f"Curva desconhecida: {curve}")
+    n = len(coords)
+    if n == 0:
+        return []
+
+    xs = [p[0] for p in coords]
+    ys = [p[1] for p in coords]
+    x0, y0 = min(xs), min(ys)
+    # Mesma escala nos dois eixos, para não distorcer as distâncias
+    extent = max(max(xs) - x0, max(ys) - y0) or 1.0
+    scale = _SIDE / extent
+
+    index = _hilbert_index if curve == 'hilbert' else _morton_index
+    keys = [index(int((x - x0) * scale), int((y - y0) * scale)) for x, y in coords]
+    return sorted(range(n), key=keys.__getitem__)
+
+# Ciclo pela curva de preenchimento do espaço. Devolve (ciclo, custo), com o
+# ciclo fechado como em christofides().
+def space_filling_curve_tour(coords, curve='hilbert'):
+    order = curve_order(coords, curve)
+    if not order:
+        return [], 0.0
+    tour = order + [order[0]]
+    # Mesmo arredondamento de instancia.euclidean, sem laço em Python
+    points = [coords[v] for v in tour]
+    cost = sum(map(round, map(math.dist, points, points[1:]), repeat(1)))
+    return tour, cost
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python curva.py <instancia_tsplib.txt> [hilbert|morton]")
+        sys.exit(1)
+
+    try:
+        coords = parse_tsplib(sys.argv[1])
+        curve = sys.argv[2] if len(sys.argv) > 2 else 'hilbert'
+        inicio = time.perf_counter()
+        tour, cost = space_filling_curve_tour(coords, curve)
+        tempo = time.perf_counter() - inicio
+        print(f"Pontos: {len(coords)}")
+        print(f"Peso da Solução ({curve}): {cost:.1f}")
+        print(f"Tempo: {tempo:.4f} segundos")
+    except Exception as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,183 @@
+import sys
+import math
+import time
+import heapq
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from christofides import christofides
+from instancia import parse_tsplib, gerar_matriz, CoordinateMatrix
+from melhoria import coordinate_neighbour_lists, make_tour, repair_around
+
+# Decomposição espacial (estilo Karp) para instâncias grandes com coordenadas.
+# Os pontos são divididos por uma árvore k-d em células de no máximo
+# `max_cell` pontos; cada célula é resolvida com o Christofides em um pool de
+# processos e os sub-ciclos são costurados de baixo para cima na árvore,
+# trocando duas arestas (uma de cada lado) perto da linha de corte. Por fim,
+# uma busca local opcional (2-opt + Or-opt) parte apenas dos pontos de costura.
+
+# Vértices mais próximos da linha de corte considerados em cada costura
+_STITCH_CANDIDATES = 16
+
+# Árvore k-d: folha = lista de índices; nó = (eixo, corte, esquerda, direita)
+def _partition(indices, coords, max_cell):
+    if len(indices) <= max_cell:
+        return indices
+
+    xs = [coords[i][0] for i in indices]
+    ys = [coords[i][1] for i in indices]
+    axis = 0 if max(xs) - min(xs) >= max(ys) - min(ys) else 1
+
+    indices = sorted(indices, key=lambda i: coords[i][axis])
+    mid = len(indices) // 2
+    split = (coords[indices[mid - 1]][axis] + coords[indices[mid]][axis]) / 2
+    return (axis, split,
+            _partition(indices[:mid], coords, max_cell),
+            _partition(indices[mid:], coords, max_cell))
+
+def _leaves(node):
+    if isinstance(node, list):
+        return [node]
+    return _leaves(node[2]) + _leaves(node[3])
+
+# Resolve uma célula (executado no pool) e devolve a ordem local dos pontos
+def _solve_cell(points):
+    m = len(points)
+    if m <= 3:
+        return list(range(m))
+    g = gerar_matriz(points)
+    _, _, tour, _, _ = christofides(g, m)
+    return tour[:-1]
+
+# Arestas (posições i, com a aresta cycle[i] -> cycle[i + 1]) incidentes aos
+# vértices mais próximos da linha de corte
+def _boundary_edges(cycle, coords, axis, split):
+    m = len(cycle)
+    near = heapq.nsmallest(
+        _STITCH_CANDIDATES, range(m),
+        key=lambda p: abs(coords[cycle[p]][axis] - split),
+    )
+    edges = set()
+    for p in near:
+        edges.add(p)
+        edges.add((p - 1) % m)
+    return edges
+
+# Une dois ciclos trocando a aresta (a1, a2) de `a` e (b1, b2) de `b` pelas
+# duas ligações mais baratas entre eles. Devolve o ciclo unido e os quatro
+# extremos das arestas trocadas.
+def _stitch(a, b, coords, axis, split):
+    def dist(u, v):
+        p, q = coords[u], coords[v]
+        return math.hypot(p[0] - q[0], p[1] - q[1])
+
+    la, lb = len(a), len(b)
+    best = (float('inf'), 0, 0, False)
+    edges_b = _boundary_edges(b, coords, axis, split)
+    for i in _boundary_edges(a, coords, axis, split):
+        a1, a2 = a[i], a[(i + 1) % la]
+        d_a = dist(a1, a2)
+        for j in edges_b:
+            b1, b2 = b[j], b[(j + 1) % lb]
+            base = d_a + dist(b1, b2)
+            # a1-b1 e a2-b2: percorre b de trás para frente
+            delta = dist(a1, b1) + dist(a2, b2) - base
+            if delta < best[0]:
+                best = (delta, i, j, True)
+            # a1-b2 e a2-b1: percorre b para frente
+            delta = dist(a1, b2) + dist(a2, b1) - base
+            if delta < best[0]:
+                best = (delta, i, j, False)
+
+    _, i, j, backwards = best
+    if backwards:
+        middle = b[j::-1] + b[:j:-1]
+    else:
+        middle = b[j + 1:] + b[:j + 1]
+    ends = (a[i], a[(i + 1) % la], b[j], b[(j + 1) % lb])
+    return a[:i + 1] + middle + a[i + 1:], ends
+
+# Costura os ciclos das células de baixo para cima na árvore k-d
+def _merge(node, cycles, seams, coords):
+    if isinstance(node, list):
+        return next(cycles)
+    axis, split, left, right = node
+    a = _merge(left, cycles, seams, coords)
+    b = _merge(right, cycles, seams, coords)
+    merged, ends = _stitch(a, b, coords, axis, split)
+    seams.update(ends)
+    return merged
+
+# Resolve a instância por decomposição. Devolve (ciclo, custo, tempos).
+def solve_decomposed(coords, max_cell=200, workers=None, local_search=True, k=8):
+    n = len(coords)
+    tempos = {}
+    if n == 0:
+        return [], 0.0, tempos
+
+    inicio = time.perf_counter()
+    tree = _partition(list(range(n)), coords, max_cell)
+    cells = _leaves(tree)
+    tempos['Particionamento'] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    points = [[coords[i] for i in cell] for cell in cells]
+    if workers == 1 or len(cells) == 1:
+        orders = list(map(_solve_cell, points))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            orders = list(pool.map(_solve_cell, points, chunksize=4))
+    cycles = [[cell[p] for p in order] for cell, order in zip(cells, orders)]
+    tempos['Células (Christofides)'] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    seams = set()
+    order = _merge(tree, iter(cycles), seams, coords)
+    tour = order + [order[0]]
+    tempos['Costura'] = time.perf_counter() - inicio
+
+    g = CoordinateMatrix(coords)
+    cost = sum(g[tour[i]][tour[i + 1]] for i in range(n))
+
+    if local_search and n > 3 and seams:
+        inicio = time.perf_counter()
+        neighbours = coordinate_neighbour_lists(coords, k)
+        t = make_tour(tour)
+        cost -= repair_around(t, g, neighbours, seams)
+        tour = t.to_list()
+        tempos['Busca Local nas Fronteiras'] = time.perf_counter() - inicio
+
+    return tour, cost, tempos
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Christofides por decomposição espacial (instâncias TSPLIB com coordenadas)",
+    )
+    parser.add_argument("arquivo", help="arquivo TSPLIB com NODE_COORD_SECTION")
+    parser.add_argument("--cell", type=int, default=200,
+                        help="número máximo de pontos por célula (padrão: 200)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processos do pool (padrão: número de CPUs)")
+    parser.add_argument("--no-local-search", action="store_true",
+                        help="não aplica a busca local nas fronteiras das células")
+    args = parser.parse_args()
+
+    try:
+        coords = parse_tsplib(args.arquivo)
+        if not coords:
+            raise ValueError("nenhuma coordenada encontrada")
+
+        tour, cost, tempos = solve_decomposed(
+            coords, max_cell=args.cell, workers=args.workers,
+            local_search=not args.no_local_search,
+        )
+
+        print(f"Pontos: {len(coords)}")
+        print(f"Peso da Solução: {cost:.1f}")
+        print("\nTempo de execução por etapa:")
+        for etapa, tempo in tempos.items():
+            print(f"- {etapa}: {tempo:.4f} segundos")
+        print(f"Tempo total: {sum(tempos.values()):.4f} segundos")
+    except Exception as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,230 @@
+import os
+import sys
+import json
+import math
+import time
+import platform
+import argparse
+import statistics
+
+from christofides import read_graph, christofides, christofides_multistart
+from melhoria import KNOWN_OPTIMA, improve_tour, coordinate_neighbour_lists
+from instancia import parse_tsplib, gerar_matriz
+from curva import space_filling_curve_tour
+
+# Suíte de desempenho (python christofides.py bench): executa cada combinação
+# de construção e opções sobre as instâncias TSPLIB do repositório, repetindo
+# cada execução, e registra a mediana e o p95 do tempo de cada etapa, o custo
+# e o gap em relação ao ótimo publicado. O resultado pode ser gravado como
+# linha de base em JSON e comparado com uma linha de base anterior: custo maior
+# ou tempo total acima da tolerância são apontados como regressão.
+
+_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Instâncias: nome -> (arquivo, tipo). 'matriz' é lido por read_graph;
+# 'coords' é TSPLIB com coordenadas (a matriz é gerada para as construções
+# que precisam dela).
+BENCH_INSTANCES = {
+    'bayg29': ('bayg29.txt', 'matriz'),
+    'att48': ('att48.txt', 'matriz'),
+    'bier127': ('bier127.txt', 'matriz'),
+    'si175': ('si175.txt', 'matriz'),
+    'a280': ('a280.txt', 'matriz'),
+    'pr299': ('pr299.txt', 'matriz'),
+    'rl1304': ('instancia.txt', 'coords'),
+}
+
+OPTIMA = {**KNOWN_OPTIMA, 'rl1304': 252948}
+
+# Combinações avaliadas: nome -> opções. As construções 'sfc' e 'decomp' só
+# se aplicam a instâncias com coordenadas.
+BENCH_CONFIGS = {
+    'christofides': {'engine': 'christofides'},
+    'christofides+2opt': {'engine': 'christofides', 'improve': '2opt'},
+    'christofides+oropt': {'engine': 'christofides', 'improve': 'oropt'},
+    'christofides+2opt+oropt': {'engine': 'christofides', 'improve': '2opt+oropt'},
+    'christofides+lk': {'engine': 'christofides', 'improve': 'lk'},
+    'multi-inicio-8': {'engine': 'christofides', 'starts': 8},
+    'sfc': {'engine': 'sfc'},
+    'sfc+2opt+oropt': {'engine': 'sfc', 'improve': '2opt+oropt'},
+    'decomp': {'engine': 'decomp'},
+}
+
+# Tolerância padrão do tempo total mediano antes de apontar regressão, e
+# aumento absoluto mínimo (em segundos) para que execuções muito curtas não
+# gerem alarmes por ruído de medição
+TIME_TOLERANCE = 0.25
+MIN_TIME_DELTA = 0.002
+
+# Carrega uma instância: devolve (matriz ou None, coordenadas ou None, n)
+def load_instance(name):
+    path, kind = BENCH_INSTANCES[name]
+    path = os.path.join(_DIR, path)
+    if kind == 'matriz':
+        g, n = read_graph(path)
+        return g, None, n
+    coords = parse_tsplib(path)
+    return None, coords, len(coords)
+
+# Uma execução: devolve (custo, tempos por etapa)
+def run_config(config, g, coords, n):
+    engine = config['engine']
+    neighbours = None
+
+    if engine == 'christofides':
+        if config.get('starts', 1) > 1:
+            _, _, tour, cost, tempos = christofides_multistart(g, n, starts=config['starts'])
+        else:
+            _, _, tour, cost, tempos = christofides(g, n)
+    elif engine == 'sfc':
+        inicio = time.perf_counter()
+        tour, cost = space_filling_curve_tour(coords)
+        tempos = {'Curva de Hilbert': time.perf_counter() - inicio}
+    elif engine == 'decomp':
+        from decomposicao import solve_decomposed
+        tour, cost, tempos = solve_decomposed(coords, workers=1)
+    else:
+        raise ValueError(f"Construção desconhecida: {engine}")
+
+    improve = config.get('improve')
+    if improve:
+        inicio = time.perf_counter()
+        if engine != 'christofides':
+            neighbours = coordinate_neighbour_lists(coords)
+        tour, cost = improve_tour(tour, cost, g, improve, neighbours=neighbours)
+        tempos[f'Melhoria ({improve})'] = time.perf_counter() - inicio
+
+    return cost, tempos
+
+# Percentil pelo posto mais próximo
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+def _summary(values):
+    return {'mediana': statistics.median(values), 'p95': percentile(values, 95)}
+
+# Executa a suíte. Devolve o dicionário da linha de base.
+def run_bench(instances=None, configs=None, repeat=3, out=sys.stdout):
+    instances = instances or list(BENCH_INSTANCES)
+    configs = configs or list(BENCH_CONFIGS)
+
+    results = {}
+    for name in instances:
+        g, coords, n = load_instance(name)
+        for config_name in configs:
+            config = BENCH_CONFIGS[config_name]
+            if config['engine'] != 'christofides' and coords is None:
+                continue
+            # As construções por matriz usam a matriz gerada das coordenadas
+            if g is None and (config['engine'] == 'christofides' or config.get('improve')):
+                g = gerar_matriz(coords)
+
+            costs, totals, stages = [], [], {}
+            for _ in range(repeat):
+                inicio = time.perf_counter()
+                cost, tempos = run_config(config, g, coords, n)
+                totals.append(time.perf_counter() - inicio)
+                costs.append(cost)
+                for etapa, t in tempos.items():
+                    stages.setdefault(etapa, []).append(t)
+
+            cost = statistics.median(costs)
+            optimum = OPTIMA.get(name)
+            entry = {
+                'instancia': name,
+                'config': config_name,
+                'n': n,
+                'custo': cost,
+                'custo_min': min(costs),
+                'gap': None if optimum is None else cost / optimum - 1,
+                'tempo_total': _summary(totals),
+                'etapas': {etapa: _summary(ts) for etapa, ts in stages.items()},
+            }
+            results[f"{name}/{config_name}"] = entry
+
+            gap = "" if entry['gap'] is None else f"{100 * entry['gap']:>7.2f}%"
+            print(f"{name:<8} {config_name:<24} {cost:>12.1f} {gap:>8} "
+                  f"{entry['tempo_total']['mediana']:>9.4f}s "
+                  f"(p95 {entry['tempo_total']['p95']:.4f}s)", file=out)
+            out.flush()
+
+    return {
+        'ambiente': {
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'repeticoes': repeat,
+        },
+        'resultados': results,
+    }
+
+# Compara com uma linha de base: devolve a lista de regressões encontradas
+def compare(current, baseline, time_tolerance=TIME_TOLERANCE):
+    regressions = []
+    for key, entry in current['resultados'].items():
+        old = baseline.get('resultados', {}).get(key)
+        if old is None:
+            continue
+
+        if entry['custo'] > old['custo'] * (1 + 1e-9):
+            regressions.append(
+                f"{key}: custo {old['custo']:.1f} -> {entry['custo']:.1f}"
+            )
+
+        before = old['tempo_total']['mediana']
+        after = entry['tempo_total']['mediana']
+        if after > before * (1 + time_tolerance) and after - before > MIN_TIME_DELTA:
+            regressions.append(
+                f"{key}: tempo mediano {before:.4f}s -> {after:.4f}s "
+                f"(+{100 * (after / before - 1):.0f}%)"
+            )
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="christofides.py bench",
+        description="Suíte de desempenho sobre as instâncias TSPLIB do repositório",
+    )
+    parser.add_argument("--instances", nargs="+", choices=list(BENCH_INSTANCES),
+                        help="instâncias avaliadas (padrão: todas)")
+    parser.add_argument("--configs", nargs="+", choices=list(BENCH_CONFIGS),
+                        help="combinações avaliadas (padrão: todas)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="execuções de cada combinação (padrão: 3)")
+    parser.add_argument("--save", metavar="ARQUIVO",
+                        help="grava os resultados como linha de base em JSON")
+    parser.add_argument("--baseline", metavar="ARQUIVO",
+                        help="linha de base para detectar regressões")
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE,
+                        help="aumento relativo do tempo mediano tolerado (padrão: 0.25)")
+    args = parser.parse_args(argv)
+
+    try:
+        baseline = None
+        if args.baseline is not None:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+
+        print(f"{'Instância':<8} {'Combinação':<24} {'Custo':>12} {'Gap':>8} {'Mediana':>10}")
+        current = run_bench(args.instances, args.configs, repeat=args.repeat)
+
+        if args.save is not None:
+            with open(args.save, 'w') as f:
+                json.dump(current, f, indent=2, ensure_ascii=False)
+                f.write("\n")
+
+        if baseline is not None:
+            regressions = compare(current, baseline, args.time_tolerance)
+            if regressions:
+                print(f"\n{len(regressions)} regressão(ões) em relação a {args.baseline}:")
+                for r in regressions:
+                    print(f"- {r}")
+                return 1
+            print(f"\nSem regressões em relação a {args.baseline}")
+        return 0
+    except Exception as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,150 @@
+import sys
+import math
+import time
+import argparse
+
+from christofides import christofides
+from instrumentacao import peak_memory
+from instancia import gerar_matriz
+from curva import space_filling_curve_tour
+from gerador import KINDS, generate_points
+
+# Benchmark de escala (python christofides.py scaling): resolve instâncias
+# sintéticas de tamanhos crescentes com cada construção, ajusta o expoente
+# empírico de cada etapa (tempo ~ c·n^b, mínimos quadrados em escala log-log)
+# e, opcionalmente, mede a memória por vértice (pico do tracemalloc em uma
+# execução separada, para não distorcer os tempos). Uma construção deixa de
+# crescer quando passa do limite de n ou quando uma execução estoura o
+# orçamento de tempo; o expoente ajustado estima até onde ela é viável.
+
+SIZES = (250, 500, 1000, 2000, 5000, 10_000, 20_000, 50_000,
+         100_000, 200_000, 500_000, 1_000_000)
+
+# Maior n tentado por construção: christofides precisa da matriz n×n e do
+# emparelhamento do networkx; decomp resolve ~n/200 células
+ENGINE_LIMITS = {
+    'christofides': 1000,
+    'decomp': 100_000,
+    'sfc': 1_000_000,
+}
+
+# Uma execução: devolve os tempos de cada etapa (segundos)
+def run_engine(engine, coords):
+    n = len(coords)
+    if engine == 'christofides':
+        inicio = time.perf_counter()
+        g = gerar_matriz(coords)
+        tempos = {'Matriz': time.perf_counter() - inicio}
+        _, _, _, _, etapas = christofides(g, n)
+        tempos.update(etapas)
+        return tempos
+    if engine == 'sfc':
+        inicio = time.perf_counter()
+        space_filling_curve_tour(coords)
+        return {'Curva de Hilbert': time.perf_counter() - inicio}
+    if engine == 'decomp':
+        from decomposicao import solve_decomposed
+        return solve_decomposed(coords, workers=1)[2]
+    raise ValueError(f"Construção desconhecida: {engine}")
+
+# Expoente b de t ~ c·n^b por mínimos quadrados em log-log. Devolve (b, c) ou
+# None com menos de dois pontos válidos.
+def fit_exponent(ns, ts):
+    pairs = [(math.log(n), math.log(t)) for n, t in zip(ns, ts) if t > 0]
+    if len(pairs) < 2:
+        return None
+    mx = sum(x for x, _ in pairs) / len(pairs)
+    my = sum(y for _, y in pairs) / len(pairs)
+    sxx = sum((x - mx) ** 2 for x, _ in pairs)
+    if sxx == 0:
+        return None
+    b = sum((x - mx) * (y - my) for x, y in pairs) / sxx
+    return b, math.exp(my - b * mx)
+
+# Executa o benchmark. Devolve {construção: {'n': [...], 'etapas': {etapa:
+# [...]}, 'total': [...], 'memoria': [...]}}.
+def run_scaling(engines, sizes=SIZES, kind='uniform', seed=0, budget=60.0,
+                memory=False, limits=None, out=sys.stdout):
+    limits = {**ENGINE_LIMITS, **(limits or {})}
+    results = {}
+    for engine in engines:
+        data = results[engine] = {'n': [], 'etapas': {}, 'total': [], 'memoria': []}
+        for n in sizes:
+            if n > limits[engine]:
+                break
+            coords = generate_points(n, kind, seed=seed)
+            tempos = run_engine(engine, coords)
+            total = sum(tempos.values())
+
+            data['n'].append(n)
+            data['total'].append(total)
+            for etapa, t in tempos.items():
+                data['etapas'].setdefault(etapa, []).append(t)
+            mem = ""
+            if memory:
+                peak = peak_memory(run_engine, engine, coords)
+                data['memoria'].append(peak)
+                mem = f" {peak / n:>10.0f} B/vértice"
+            print(f"{engine:<13} n={n:<9} {total:>10.4f}s{mem}", file=out)
+            out.flush()
+
+            if total > budget:
+                print(f"{engine:<13} orçamento de {budget:g}s excedido: interrompido", file=out)
+                break
+    return results
+
+def report(results, budget, out=sys.stdout):
+    for engine, data in results.items():
+        print(f"\n{engine}:", file=out)
+        ns = data['n']
+        for etapa, ts in data['etapas'].items():
+            # Etapas que não aparecem em todos os tamanhos não são ajustadas
+            fit = fit_exponent(ns, ts) if len(ts) == len(ns) else None
+            expoente = "   -" if fit is None else f"{fit[0]:>4.2f}"
+            print(f"  {etapa:<32} expoente {expoente}  ({ts[-1]:.4f}s em n={ns[-1]})", file=out)
+
+        fit = fit_exponent(ns, data['total'])
+        if fit is not None and fit[0] > 0:
+            b, c = fit
+            viable = (budget / c) ** (1 / b)
+            print(f"  {'Total':<32} expoente {b:>4.2f}  "
+                  f"(viável até n ≈ {viable:,.0f} em {budget:g}s)", file=out)
+        if data['memoria']:
+            print(f"  Memória: {data['memoria'][-1] / ns[-1]:,.0f} bytes por vértice "
+                  f"em n={ns[-1]}", file=out)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="christofides.py scaling",
+        description="Expoentes empíricos de cada etapa em instâncias sintéticas",
+    )
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINE_LIMITS),
+                        default=list(ENGINE_LIMITS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES),
+                        help="tamanhos avaliados (limitados por construção)")
+    parser.add_argument("--kind", choices=KINDS, default='uniform')
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget", type=float, default=60.0,
+                        help="tempo máximo por execução, em segundos (padrão: 60)")
+    parser.add_argument("--max-n", type=int,
+                        help="limite de n para todas as construções")
+    parser.add_argument("--memory", action="store_true",
+                        help="mede a memória por vértice (execução extra com tracemalloc)")
+    args = parser.parse_args(argv)
+
+    limits = None
+    if args.max_n is not None:
+        limits = {engine: min(limit, args.max_n) for engine, limit in ENGINE_LIMITS.items()}
+
+    try:
+        results = run_scaling(args.engines, sorted(args.sizes), kind=args.kind,
+                              seed=args.seed, budget=args.budget, memory=args.memory,
+                              limits=limits)
+        report(results, args.budget)
+        return 0
+    except Exception as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
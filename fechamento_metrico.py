@@ -0,0 +1,144 @@
+import sys
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from memoria_compartilhada import InstanceRegistry, open_view, close_view
+
+# Desigualdade triangular em matrizes densas. A garantia de 1,5 do Christofides
+# só vale se g[i][j] <= g[i][k] + g[k][j] para todo trio; matrizes vindas de
+# outras fontes podem violá-la sem aviso.
+#
+#   triangle_audit  amostra trios aleatórios e informa a taxa de violação,
+#                   em O(amostras), antes de decidir pelo reparo
+#   metric_closure  reparo completo: Floyd–Warshall em blocos de linhas, com
+#                   cada linha relaxada de uma vez (uma compreensão sobre a
+#                   linha inteira, sem indexação por elemento) e, para n
+#                   grande, as faixas de linhas distribuídas em processos
+#                   sobre memória compartilhada
+
+EPS = 1e-9
+
+# Auditoria por amostragem. Devolve {'amostras', 'violacoes', 'taxa',
+# 'maior_excesso'}; o excesso é g[i][j] - (g[i][k] + g[k][j]).
+def triangle_audit(g, n, samples=20000, seed=0):
+    if n < 3:
+        return {'amostras': 0, 'violacoes': 0, 'taxa': 0.0, 'maior_excesso': 0.0}
+
+    rng = random.Random(seed)
+    violations = 0
+    worst = 0.0
+    for _ in range(samples):
+        i, j, k = rng.sample(range(n), 3)
+        excess = g[i][j] - (g[i][k] + g[k][j])
+        if excess > EPS:
+            violations += 1
+            worst = max(worst, excess)
+    return {
+        'amostras': samples,
+        'violacoes': violations,
+        'taxa': violations / samples,
+        'maior_excesso': worst,
+    }
+
+# min(row[j], dik + krow[j]) para toda a linha
+def _relax(row, dik, krow):
+    return array('d', [a if a <= dik + b else dik + b for a, b in zip(row, krow)])
+
+# Linhas do próprio bloco de intermediários [k0, k1): ordem k externa (o
+# Floyd–Warshall clássico restrito a essas linhas)
+def _relax_block_rows(flat, n, k0, k1):
+    for k in range(k0, k1):
+        krow = array('d', flat[k * n:(k + 1) * n])
+        for i in range(k0, k1):
+            if i == k:
+                continue
+            dik = flat[i * n + k]
+            flat[i * n:(i + 1) * n] = _relax(flat[i * n:(i + 1) * n], dik, krow)
+
+# Demais linhas, de i0 a i1: com as linhas do bloco já finais, cada linha é
+# independente e recebe todos os intermediários do bloco em sequência
+def _relax_rows(flat, n, i0, i1, k0, k1):
+    inf = float('inf')
+    for i in range(i0, i1):
+        if k0 <= i < k1:
+            continue
+        row = array('d', flat[i * n:(i + 1) * n])
+        for k in range(k0, k1):
+            dik = row[k]
+            if dik == inf:
+                continue
+            row = _relax(row, dik, flat[k * n:(k + 1) * n])
+        flat[i * n:(i + 1) * n] = row
+
+# Estado de cada processo do pool: visão gravável da matriz compartilhada
+_closure_state = {}
+
+def _init_closure_worker(handle):
+    shm, flat, rows = open_view(handle, writable=True)
+    for row in rows:
+        row.release()
+    _closure_state['shm'] = shm
+    _closure_state['flat'] = flat
+    _closure_state['n'] = handle.cols
+
+def _relax_strip(i0, i1, k0, k1):
+    _relax_rows(_closure_state['flat'], _closure_state['n'], i0, i1, k0, k1)
+
+# Fecho métrico (distâncias de caminho mínimo) da matriz. Processa os
+# intermediários em blocos de `block` vértices; com workers > 1, as faixas
+# de linhas fora do bloco são atualizadas em paralelo. Devolve (nova matriz,
+# número de entradas reduzidas).
+def metric_closure(g, n, block=64, workers=1):
+    if n == 0:
+        return [], 0
+
+    if workers <= 1:
+        flat = array('d')
+        for row in g:
+            flat.extend(row)
+        for k0 in range(0, n, block):
+            k1 = min(n, k0 + block)
+            _relax_block_rows(flat, n, k0, k1)
+            _relax_rows(flat, n, 0, n, k0, k1)
+        closed = [flat[i * n:(i + 1) * n].tolist() for i in range(n)]
+    else:
+        strip = max(block, -(-n // (4 * workers)))
+        with InstanceRegistry() as registry:
+            handle = registry.acquire('fechamento', g)
+            shm, flat, rows = open_view(handle, writable=True)
+            try:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_closure_worker,
+                                         initargs=(handle,)) as pool:
+                    for k0 in range(0, n, block):
+                        k1 = min(n, k0 + block)
+                        _relax_block_rows(flat, n, k0, k1)
+                        # Barreira: todas as faixas terminam antes do próximo bloco
+                        list(pool.map(_relax_strip, *zip(*[
+                            (i0, min(n, i0 + strip), k0, k1) for i0 in range(0, n, strip)
+                        ])))
+                closed = [flat[i * n:(i + 1) * n].tolist() for i in range(n)]
+            finally:
+                close_view(shm, flat, rows)
+
+    changed = sum(
+        1 for i in range(n) for a, b in zip(g[i], closed[i]) if b < a - EPS
+    )
+    return closed, changed
+
+if __name__ == "__main__":
+    from christofides import read_graph
+
+    if len(sys.argv) < 2:
+        print("Uso: python fechamento_metrico.py <graph.txt>")
+        sys.exit(1)
+
+    try:
+        g, n = read_graph(sys.argv[1])
+        audit = triangle_audit(g, n)
+        print(f"Violações da desigualdade triangular: {audit['violacoes']} de "
+              f"{audit['amostras']} trios ({100 * audit['taxa']:.3f}%), "
+              f"maior excesso {audit['maior_excesso']:.3f}")
+    except Exception as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,151 @@
+import os
+import sys
+import json
+import math
+import random
+import argparse
+from array import array
+
+from instancia import gerar_matriz, salvar_matriz_formatada
+
+# Gerador de instâncias sintéticas com coordenadas, para medir a escala dos
+# algoritmos além das instâncias do repositório:
+#
+#   uniform    pontos uniformes no quadrado [0, size)²
+#   clustered  ~√n/2 centros uniformes, pontos normais em torno de cada centro
+#   grid       reticulado de ⌈√n⌉ colunas com pequena perturbação (evita empates)
+#
+# A mesma semente gera sempre a mesma instância. Os formatos de saída são os
+# aceitos pelo projeto:
+#
+#   tsplib  NODE_COORD_SECTION (instancia.parse_tsplib, --engine sfc/decomp)
+#   json    {"coords": [[x, y], ...]} (serviço HTTP e modo worker)
+#   matriz  matriz de distâncias em texto (read_graph)
+#   bin     matriz n×n em float64 (corpo application/octet-stream do serviço)
+#
+# Os formatos de matriz têm n² valores e só são gerados até MAX_MATRIX_N.
+
+KINDS = ('uniform', 'clustered', 'grid')
+FORMATS = ('tsplib', 'json', 'matriz', 'bin')
+MAX_MATRIX_N = 5000
+
+_EXTENSIONS = {'tsplib': '.tsp', 'json': '.json', 'matriz': '.txt', 'bin': '.bin'}
+
+def generate_points(n, kind='uniform', seed=0, size=1_000_000.0):
+    if kind not in KINDS:
+        raise ValueError(f"Tipo de instância desconhecido: {kind}")
+    rng = random.Random(seed)
+
+    if kind == 'uniform':
+        return [(rng.random() * size, rng.random() * size) for _ in range(n)]
+
+    if kind == 'clustered':
+        k = max(1, int(math.sqrt(n) / 2))
+        centres = [(rng.random() * size, rng.random() * size) for _ in range(k)]
+        sigma = size / (4 * math.sqrt(k))
+        points = []
+        for _ in range(n):
+            cx, cy = centres[rng.randrange(k)]
+            points.append((rng.gauss(cx, sigma), rng.gauss(cy, sigma)))
+        return points
+
+    side = max(1, math.ceil(math.sqrt(n)))
+    step = size / side
+    jitter = step / 100
+    return [
+        ((i % side) * step + rng.uniform(-jitter, jitter),
+         (i // side) * step + rng.uniform(-jitter, jitter))
+        for i in range(n)
+    ]
+
+def write_tsplib(path, coords, name):
+    lines = [
+        f"NAME : {name}",
+        "COMMENT : instância sintética (gerador.py)",
+        "TYPE : TSP",
+        f"DIMENSION : {len(coords)}",
+        "EDGE_WEIGHT_TYPE : EUC_2D",
+        "NODE_COORD_SECTION",
+    ]
+    lines.extend(f"{i} {x:.3f} {y:.3f}" for i, (x, y) in enumerate(coords, 1))
+    lines += ["EOF", ""]
+    with open(path, 'w') as f:
+        f.write("\n".join(lines))
+
+def write_json(path, coords):
+    with open(path, 'w') as f:
+        json.dump({'coords': [[round(x, 3), round(y, 3)] for x, y in coords]}, f,
+                  separators=(',', ':'))
+
+def write_binary_matrix(path, matrix):
+    with open(path, 'wb') as f:
+        for row in matrix:
+            f.write(array('d', row).tobytes())
+
+# Grava a instância nos formatos pedidos. Devolve os caminhos gerados.
+def write_instance(coords, out_dir, name, formats=('tsplib',)):
+    os.makedirs(out_dir, exist_ok=True)
+    # As coordenadas gravadas têm 3 casas: todos os formatos usam esses valores
+    coords = [(round(x, 3), round(y, 3)) for x, y in coords]
+
+    paths = []
+    matrix = None
+    for fmt in formats:
+        if fmt not in FORMATS:
+            raise ValueError(f"Formato desconhecido: {fmt}")
+        path = os.path.join(out_dir, name + _EXTENSIONS[fmt])
+
+        if fmt in ('matriz', 'bin'):
+            if len(coords) > MAX_MATRIX_N:
+                raise ValueError(f"Formato '{fmt}' limitado a n <= {MAX_MATRIX_N} "
+                                 f"(n² valores); use tsplib ou json")
+            if matrix is None:
+                matrix = gerar_matriz(coords)
+
+        if fmt == 'tsplib':
+            write_tsplib(path, coords, name)
+        elif fmt == 'json':
+            write_json(path, coords)
+        elif fmt == 'matriz':
+            salvar_matriz_formatada(matrix, path)
+        else:
+            write_binary_matrix(path, matrix)
+        paths.append(path)
+    return paths
+
+# Tamanho escrito de forma compacta nos nomes dos arquivos (1k, 10k, 1m)
+def size_label(n):
+    if n >= 1_000_000 and n % 1_000_000 == 0:
+        return f"{n // 1_000_000}m"
+    if n >= 1000 and n % 1000 == 0:
+        return f"{n // 1000}k"
+    return str(n)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gerador de instâncias sintéticas do TSP")
+    parser.add_argument("--n", type=int, nargs="+", default=[1000, 10_000, 100_000],
+                        help="números de pontos (padrão: 1000 10000 100000)")
+    parser.add_argument("--kind", choices=KINDS, nargs="+", default=['uniform'],
+                        help="distribuição dos pontos (padrão: uniform)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=FORMATS, nargs="+", default=['tsplib'],
+                        help="formatos gravados (padrão: tsplib)")
+    parser.add_argument("--out-dir", default="instancias",
+                        help="diretório de saída (padrão: instancias)")
+    args = parser.parse_args()
+
+    try:
+        for kind in args.kind:
+            for n in args.n:
+                name = f"{kind}-{size_label(n)}-s{args.seed}"
+                coords = generate_points(n, kind, seed=args.seed)
+                formats = [f for f in args.format if f in ('tsplib', 'json') or n <= MAX_MATRIX_N]
+                for path in write_instance(coords, args.out_dir, name, formats):
+                    print(path)
+                skipped = set(args.format) - set(formats)
+                if skipped:
+                    print(f"{name}: {', '.join(sorted(skipped))} omitido(s) (n > {MAX_MATRIX_N})",
+                          file=sys.stderr)
+    except Exception as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,315 @@
+import sys
+import heapq
+from array import array
+from collections import OrderedDict
+
+from christofides import (
+    find_odd_vertices, min_weight_perfect_matching, build_multigraph,
+    euler_shortcut_tour, _begin, _record,
+)
+
+# Entrada esparsa (redes viárias): lista de arestas em vez da matriz completa.
+# Christofides exige a desigualdade triangular, que só vale para as distâncias
+# de caminho mínimo (fechamento métrico). Em vez de calcular a tabela de todos
+# os pares, MetricClosure calcula as distâncias sob demanda:
+#
+#   closure[u]          linha completa de u (Dijkstra a partir de u), mantida
+#                       em um LRU limitado de linhas
+#   closure.point[u][v] distância de um par isolado: usa uma linha em cache se
+#                       houver; senão, Dijkstra a partir de u interrompido ao
+#                       chegar a v (pares mantidos em um segundo LRU)
+#
+# A MST do fechamento métrico tem o mesmo peso que a MST do grafo esparso (toda
+# aresta do fechamento é um caminho de arestas do grafo), então ela é obtida
+# diretamente das arestas em O(m log n). Só o emparelhamento precisa de linhas
+# completas, e apenas dos vértices ímpares; os atalhos e a busca local usam
+# consultas de pares.
+
+# Lê uma lista de arestas: primeira linha com n, depois "u v peso" por linha
+# (vértices de 0 a n-1, separados por espaço ou vírgula; '#' inicia
+# comentário). O grafo é não direcionado; arestas repetidas ficam com o menor
+# peso. Devolve (adjacência, n).
+def read_edge_list(path):
+    with open(path) as f:
+        lines = [line.split('#', 1)[0].strip() for line in f]
+    lines = [line for line in lines if line]
+    if not lines:
+        raise ValueError("Arquivo vazio")
+
+    try:
+        n = int(lines[0])
+    except ValueError:
+        raise ValueError("Primeira linha deve ser um inteiro (número de vértices)")
+    if n <= 0:
+        raise ValueError("Número de vértices deve ser positivo")
+
+    best = {}
+    for i, line in enumerate(lines[1:], 2):
+        parts = line.replace(',', ' ').split()
+        if len(parts) != 3:
+            raise ValueError(f"Linha {i}: esperado 'u v peso', encontrado '{line}'")
+        try:
+            u, v, w = int(parts[0]), int(parts[1]), float(parts[2])
+        except ValueError:
+            raise ValueError(f"Linha {i}: valores inválidos em '{line}'")
+        if not (0 <= u < n and 0 <= v < n):
+            raise ValueError(f"Linha {i}: vértice fora do intervalo 0..{n - 1}")
+        if w < 0:
+            raise ValueError(f"Peso negativo na linha {i}: {w}")
+        if u == v:
+            continue
+        key = (u, v) if u < v else (v, u)
+        if key not in best or w < best[key]:
+            best[key] = w
+
+    adj = [[] for _ in range(n)]
+    for (u, v), w in best.items():
+        adj[u].append((v, w))
+        adj[v].append((u, w))
+    return adj, n
+
+# MST do grafo esparso (Prim com heap), no formato de prim_mst. Com
+# `counters`, registra as inserções e remoções no heap.
+def sparse_mst(adj, n, counters=None):
+    in_mst = bytearray(n)
+    key = [float('inf')] * n
+    parent = [-1] * n
+    key[0] = 0.0
+    heap = [(0.0, 0)]
+    mst_edges = []
+    total_weight = 0.0
+    pushes, pops = 1, 0
+
+    while heap:
+        weight, u = heapq.heappop(heap)
+        pops += 1
+        if in_mst[u]:
+            continue
+        in_mst[u] = 1
+        total_weight += weight
+        if parent[u] != -1:
+            mst_edges.append((parent[u], u, {'weight': weight}))
+
+        for v, w in adj[u]:
+            if not in_mst[v] and w < key[v]:
+                key[v] = w
+                parent[v] = u
+                heapq.heappush(heap, (w, v))
+                pushes += 1
+
+    if len(mst_edges) != n - 1:
+        raise ValueError("O grafo é desconexo: não existe ciclo pelos vértices")
+    if counters is not None:
+        counters['heap_pushes'] = counters.get('heap_pushes', 0) + pushes
+        counters['heap_pops'] = counters.get('heap_pops', 0) + pops
+    return mst_edges, total_weight
+
+class MetricClosure:
+    def __init__(self, adj, n=None, max_rows=256, max_pairs=1_000_000):
+        self.adj = adj
+        self.n = len(adj) if n is None else n
+        self.max_rows = max_rows
+        self.max_pairs = max_pairs
+        self._rows = OrderedDict()
+        self._pairs = OrderedDict()
+        self.point = _PointView(self)
+        # Métricas
+        self.row_hits = 0
+        self.row_computations = 0
+        self.pair_hits = 0
+        self.pair_searches = 0
+
+    def __len__(self):
+        return self.n
+
+    # Linha completa de distâncias a partir de u
+    def __getitem__(self, u):
+        row = self._rows.get(u)
+        if row is not None:
+            self._rows.move_to_end(u)
+            self.row_hits += 1
+            return row
+
+        row = self._dijkstra(u)
+        self.row_computations += 1
+        self._rows[u] = row
+        while len(self._rows) > self.max_rows:
+            self._rows.popitem(last=False)
+        return row
+
+    def _dijkstra(self, source):
+        dist = array('d', [float('inf')]) * self.n
+        dist[source] = 0.0
+        heap = [(0.0, source)]
+        adj = self.adj
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            for v, w in adj[u]:
+                nd = d + w
+                if nd < dist[v]:
+                    dist[v] = nd
+                    heapq.heappush(heap, (nd, v))
+        return dist
+
+    # Distância de um par, sem calcular a linha inteira
+    def distance(self, u, v):
+        if u == v:
+            return 0.0
+        row = self._rows.get(u)
+        if row is not None:
+            return row[v]
+        row = self._rows.get(v)
+        if row is not None:
+            return row[u]
+
+        key = (u, v) if u < v else (v, u)
+        d = self._pairs.get(key)
+        if d is not None:
+            self._pairs.move_to_end(key)
+            self.pair_hits += 1
+            return d
+
+        d = self._search(u, v)
+        self.pair_searches += 1
+        self._pairs[key] = d
+        while len(self._pairs) > self.max_pairs:
+            self._pairs.popitem(last=False)
+        return d
+
+    # Dijkstra interrompido ao fixar o destino
+    def _search(self, source, target):
+        dist = {source: 0.0}
+        done = set()
+        heap = [(0.0, source)]
+        adj = self.adj
+        while heap:
+            d, u = heapq.heappop(heap)
+            if u == target:
+                return d
+            if u in done:
+                continue
+            done.add(u)
+            for v, w in adj[u]:
+                nd = d + w
+                if nd < dist.get(v, float('inf')):
+                    dist[v] = nd
+                    heapq.heappush(heap, (nd, v))
+        return float('inf')
+
+    # Os k vértices mais próximos de cada vértice (Dijkstra interrompido após
+    # k vértices), para as listas de vizinhos da busca local
+    def neighbour_lists(self, k=10):
+        k = min(k, self.n - 1)
+        neighbours = []
+        adj = self.adj
+        for source in range(self.n):
+            dist = {source: 0.0}
+            done = []
+            seen = set()
+            heap = [(0.0, source)]
+            while heap and len(done) <= k:
+                d, u = heapq.heappop(heap)
+                if u in seen:
+                    continue
+                seen.add(u)
+                done.append(u)
+                for v, w in adj[u]:
+                    nd = d + w
+                    if nd < dist.get(v, float('inf')):
+                        dist[v] = nd
+                        heapq.heappush(heap, (nd, v))
+            neighbours.append(done[1:k + 1])
+        return neighbours
+
+    def stats(self):
+        return {
+            'linhas_calculadas': self.row_computations,
+            'linhas_em_cache': self.row_hits,
+            'pares_calculados': self.pair_searches,
+            'pares_em_cache': self.pair_hits,
+        }
+
+# Visão por pares: closure.point[u][v] chama closure.distance(u, v)
+class _PointView:
+    def __init__(self, closure):
+        self.closure = closure
+
+    def __len__(self):
+        return self.closure.n
+
+    def __getitem__(self, u):
+        return _PointRow(self.closure, u)
+
+class _PointRow:
+    __slots__ = ('closure', 'u')
+
+    def __init__(self, closure, u):
+        self.closure = closure
+        self.u = u
+
+    def __len__(self):
+        return self.closure.n
+
+    def __getitem__(self, v):
+        return self.closure.distance(self.u, v)
+
+# Christofides sobre o fechamento métrico de um grafo esparso. Mesmas etapas e
+# mesmo retorno de christofides(); os contadores trazem as consultas feitas
+# ao fechamento em cada etapa.
+def christofides_sparse(closure, stats=None):
+    n = closure.n
+    if n <= 1:
+        return [], 0.0, [0, 0] if n == 1 else [], 0.0, {}
+    tempos = {}
+
+    counters = {}
+    inicio = _begin(stats)
+    mst_edges, mst_weight = sparse_mst(closure.adj, n, counters=counters)
+    _record(tempos, stats, 'MST', inicio, counters)
+
+    inicio = _begin(stats)
+    odd_vertices = find_odd_vertices(mst_edges, n)
+    _record(tempos, stats, 'Vértices Ímpares', inicio, {'odd_vertices': len(odd_vertices)})
+
+    # Uma linha completa por vértice ímpar (consultadas em sequência, então o
+    # LRU de linhas não precisa guardar todas)
+    before = closure.row_computations
+    counters = {}
+    inicio = _begin(stats)
+    matching_edges = min_weight_perfect_matching(closure, odd_vertices, counters=counters)
+    counters['dijkstra_rows'] = closure.row_computations - before
+    _record(tempos, stats, 'Emparelhamento', inicio, counters)
+
+    inicio = _begin(stats)
+    multigraph_edges = build_multigraph(mst_edges, matching_edges, n)
+    _record(tempos, stats, 'Multigrafo', inicio, {'multigraph_edges': len(multigraph_edges)})
+
+    before = closure.pair_searches
+    counters = {}
+    inicio = _begin(stats)
+    tour, cost = euler_shortcut_tour(multigraph_edges, n, closure.point, counters=counters)
+    counters['dijkstra_pairs'] = closure.pair_searches - before
+    _record(tempos, stats, 'Circuito Euleriano + Atalhos', inicio, counters)
+
+    return mst_edges, mst_weight, tour, cost, tempos
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python grafo_esparso.py <arestas.txt>")
+        sys.exit(1)
+
+    try:
+        adj, n = read_edge_list(sys.argv[1])
+        closure = MetricClosure(adj, n)
+        _, mst_weight, tour, cost, tempos = christofides_sparse(closure)
+        print(f"Vértices: {n}, arestas: {sum(map(len, adj)) // 2}")
+        print(f"Peso da árvore geradora mínima: {mst_weight}")
+        print(f"Peso da Solução: {cost}")
+        for etapa, t in tempos.items():
+            print(f"- {etapa}: {t:.6f} segundos")
+        print(f"Fechamento métrico: {closure.stats()}")
+    except Exception as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        sys.exit(1)
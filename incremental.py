@@ -0,0 +1,348 @@
+import heapq
+from collections import deque
+
+from christofides import (
+    prim_mst, find_odd_vertices, min_weight_perfect_matching,
+    build_multigraph, euler_shortcut_tour,
+)
+from melhoria import ArrayTour, neighbour_lists, repair_around
+
+# Resolução incremental: mantém a MST, os vértices de grau ímpar, o
+# emparelhamento e o ciclo entre atualizações. Ao mudar o peso de uma aresta,
+# inserir ou remover um vértice, só as partes afetadas são recalculadas: a MST
+# é reparada (troca de uma aresta, ou reconexão dos componentes), apenas os
+# vértices cuja paridade mudou são reemparelhados e o ciclo é reparado com
+# busca local a partir dos vértices envolvidos.
+class IncrementalChristofides:
+    def __init__(self, g, n=None, k=10):
+        n = len(g) if n is None else n
+        self.g = [list(row) for row in g]
+        self.n = n
+        self.k = k
+
+        mst_edges, _ = prim_mst(self.g, n)
+        self.tree = [set() for _ in range(n)]
+        for u, v, _ in mst_edges:
+            self.tree[u].add(v)
+            self.tree[v].add(u)
+
+        odd = find_odd_vertices(mst_edges, n)
+        self.mate = [-1] * n
+        for u, v in min_weight_perfect_matching(self.g, odd):
+            self.mate[u] = v
+            self.mate[v] = u
+
+        self.neighbours = neighbour_lists(self.g, n, k)
+        tour, self.cost = euler_shortcut_tour(self._multigraph(), n, self.g)
+        self.t = ArrayTour(tour)
+
+    # Ciclo atual (fechado)
+    @property
+    def tour(self):
+        return self.t.to_list()
+
+    @property
+    def mst_weight(self):
+        return sum(self.g[u][v] for u in range(self.n) for v in self.tree[u] if u < v)
+
+    @property
+    def matching(self):
+        return [(u, v) for u, v in enumerate(self.mate) if u < v]
+
+    def _multigraph(self):
+        mst_edges = [(u, v, None) for u in range(self.n) for v in self.tree[u] if u < v]
+        return build_multigraph(mst_edges, self.matching, self.n)
+
+    # Reconstrói o ciclo de Christofides a partir da MST e do emparelhamento
+    # mantidos (sem recalculá-los) e fica com ele se for melhor que o atual
+    def rebuild_tour(self):
+        tour, cost = euler_shortcut_tour(self._multigraph(), self.n, self.g)
+        if cost < self.cost:
+            self.t = ArrayTour(tour)
+            self.cost = cost
+        return self.cost
+
+    # ---- MST ----
+
+    # Caminho entre u e v na árvore, como lista de arestas
+    def _tree_path(self, u, v):
+        parent = {u: None}
+        queue = deque([u])
+        while queue:
+            x = queue.popleft()
+            if x == v:
+                break
+            for y in self.tree[x]:
+                if y not in parent:
+                    parent[y] = x
+                    queue.append(y)
+
+        path = []
+        while parent[v] is not None:
+            path.append((parent[v], v))
+            v = parent[v]
+        return path
+
+    # Vértices alcançáveis a partir de `root` na árvore
+    def _component(self, root):
+        seen = {root}
+        stack = [root]
+        while stack:
+            x = stack.pop()
+            for y in self.tree[x]:
+                if y not in seen:
+                    seen.add(y)
+                    stack.append(y)
+        return seen
+
+    # Reconecta os componentes da floresta com as arestas mais baratas entre
+    # eles (Borůvka), varrendo sempre os vértices do menor componente. Os graus
+    # anteriores dos vértices que ganham arestas são registrados em old_degree.
+    def _reconnect(self, roots, old_degree):
+        components = [self._component(r) for r in roots]
+        while len(components) > 1:
+            components.sort(key=len)
+            small = components[0]
+            best = (float('inf'), -1, -1)
+            for a in small:
+                row = self.g[a]
+                for b in range(self.n):
+                    if b not in small and row[b] < best[0]:
+                        best = (row[b], a, b)
+            _, a, b = best
+            for v in (a, b):
+                old_degree.setdefault(v, len(self.tree[v]))
+            self._link(a, b)
+            merged = small
+            for comp in components[1:]:
+                if b in comp:
+                    merged = merged | comp
+                    components.remove(comp)
+                    break
+            components[0] = merged
+
+    def _link(self, a, b):
+        self.tree[a].add(b)
+        self.tree[b].add(a)
+
+    def _unlink(self, a, b):
+        self.tree[a].discard(b)
+        self.tree[b].discard(a)
+
+    # ---- Emparelhamento ----
+
+    # Reemparelha os vértices afetados e os seus parceiros atuais
+    def _rematch(self, affected):
+        pool = set()
+        for v in affected:
+            pool.add(v)
+            if self.mate[v] != -1:
+                pool.add(self.mate[v])
+        for v in pool:
+            self.mate[v] = -1
+
+        odd = sorted(v for v in pool if len(self.tree[v]) % 2 == 1)
+        for u, v in min_weight_perfect_matching(self.g, odd):
+            self.mate[u] = v
+            self.mate[v] = u
+
+    # Vértices cuja paridade de grau na árvore mudou
+    def _parity_changes(self, old_degree):
+        return {v for v, d in old_degree.items() if (len(self.tree[v]) - d) % 2}
+
+    # ---- Atualizações ----
+
+    # Muda o peso da aresta {u, v}
+    def update_weight(self, u, v, w):
+        g = self.g
+        old = g[u][v]
+        if w == old:
+            return
+        g[u][v] = g[v][u] = w
+
+        # Listas de vizinhos: só as linhas de u e v mudaram
+        for x in (u, v):
+            self.neighbours[x] = _closest(g[x], x, self.n, self.k)
+
+        # Ciclo: o custo muda se a aresta estiver nele
+        if self.t.next(u) == v or self.t.prev(u) == v:
+            self.cost += w - old
+
+        # MST
+        touched = {u, v}
+        old_degree = {}
+        if v in self.tree[u]:
+            if w > old:
+                # A aresta pode ter deixado de ser a mais barata do corte
+                old_degree = {u: len(self.tree[u]), v: len(self.tree[v])}
+                self._unlink(u, v)
+                self._reconnect([u, v], old_degree)
+        elif w < old:
+            # A aresta pode substituir a mais cara do caminho entre u e v
+            path = self._tree_path(u, v)
+            a, b = max(path, key=lambda e: g[e[0]][e[1]])
+            if w < g[a][b]:
+                old_degree = {x: len(self.tree[x]) for x in (u, v, a, b)}
+                self._unlink(a, b)
+                self._link(u, v)
+                touched.update((a, b))
+
+        # Emparelhamento
+        affected = self._parity_changes(old_degree)
+        if self.mate[u] == v and w > old:
+            affected.update((u, v))
+        elif w < old and self.mate[u] != -1 and self.mate[v] != -1 and self.mate[u] != v:
+            affected.update((u, v))
+        if affected:
+            self._rematch(affected)
+            touched.update(affected)
+
+        self.cost -= repair_around(self.t, g, self.neighbours, touched)
+
+    # Insere um novo vértice com as distâncias `row` até os vértices atuais.
+    # O novo vértice recebe o índice n.
+    def add_node(self, row):
+        g = self.g
+        n = self.n
+        x = n
+        row = [float(d) for d in row[:n]]
+
+        for i in range(n):
+            g[i].append(row[i])
+        g.append(row + [0.0])
+        self.n = n + 1
+        self.tree.append(set())
+        self.mate.append(-1)
+
+        # MST: a nova árvore usa apenas arestas da árvore antiga e arestas do
+        # novo vértice (Kruskal sobre ~2n arestas)
+        old_degree = {v: len(self.tree[v]) for v in range(n)}
+        edges = [(g[a][b], a, b) for a in range(n) for b in self.tree[a] if a < b]
+        edges += [(row[i], i, x) for i in range(n)]
+        edges.sort()
+        parent = list(range(n + 1))
+
+        def find(a):
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            return a
+
+        tree = [set() for _ in range(n + 1)]
+        for _, a, b in edges:
+            ra, rb = find(a), find(b)
+            if ra != rb:
+                parent[ra] = rb
+                tree[a].add(b)
+                tree[b].add(a)
+        self.tree = tree
+        old_degree[x] = 0
+
+        # Listas de vizinhos: a do novo vértice e as que passam a incluí-lo
+        self.neighbours.append(_closest(g[x], x, self.n, self.k))
+        for i in range(n):
+            nb = self.neighbours[i]
+            if len(nb) < self.k or row[i] < g[i][nb[-1]]:
+                nb.append(x)
+                nb.sort(key=g[i].__getitem__)
+                del nb[self.k:]
+
+        # Ciclo: inserção mais barata do novo vértice
+        order = self.t.to_list()[:-1]
+        best = (float('inf'), 0)
+        for p in range(len(order)):
+            a, b = order[p], order[(p + 1) % len(order)]
+            delta = g[a][x] + g[x][b] - g[a][b]
+            if delta < best[0]:
+                best = (delta, p)
+        delta, p = best
+        a, b = order[p], order[(p + 1) % len(order)]
+        order.insert(p + 1, x)
+        self.t = ArrayTour(order)
+        self.cost += delta
+
+        affected = self._parity_changes(old_degree)
+        if affected:
+            self._rematch(affected)
+
+        self.cost -= repair_around(self.t, g, self.neighbours, {x, a, b} | affected)
+        return x
+
+    # Remove o vértice x. Para manter os índices contíguos, o último vértice
+    # (n - 1) passa a ter o índice x.
+    def remove_node(self, x):
+        g = self.g
+        t = self.t
+        n = self.n
+
+        # Ciclo: liga o antecessor ao sucessor de x
+        p, q = t.prev(x), t.next(x)
+        self.cost += g[p][q] - g[p][x] - g[x][q]
+        order = [v for v in t.to_list()[:-1] if v != x]
+
+        # MST: retira x e reconecta os componentes que sobraram
+        roots = list(self.tree[x])
+        old_degree = {v: len(self.tree[v]) for v in roots}
+        for y in roots:
+            self._unlink(x, y)
+        mate = self.mate[x]
+        if mate != -1:
+            self.mate[mate] = -1
+            self.mate[x] = -1
+
+        # Isola x da reconexão com peso infinito na sua linha
+        saved = g[x]
+        g[x] = [float('inf')] * n
+        column = [g[i][x] for i in range(n)]
+        for i in range(n):
+            g[i][x] = float('inf')
+        self._reconnect(roots, old_degree)
+        g[x] = saved
+        for i in range(n):
+            g[i][x] = column[i]
+
+        affected = self._parity_changes(old_degree)
+        if mate != -1:
+            affected.add(mate)
+
+        # Renumera o último vértice para o índice x
+        last = n - 1
+        relabel = {last: x} if x != last else {}
+        last_row = g.pop()
+        if relabel:
+            g[x] = last_row
+            for row in g:
+                row[x] = row[last]
+            self.tree[x] = self.tree[last]
+            for y in self.tree[x]:
+                self.tree[y].discard(last)
+                self.tree[y].add(x)
+            self.mate[x] = self.mate[last]
+            if self.mate[x] != -1:
+                self.mate[self.mate[x]] = x
+            order = [x if v == last else v for v in order]
+            p, q = relabel.get(p, p), relabel.get(q, q)
+            affected = {relabel.get(v, v) for v in affected}
+        for row in g:
+            row.pop()
+        self.tree.pop()
+        self.mate.pop()
+        self.n = n - 1
+
+        # Listas de vizinhos: recalcula as que continham x ou o último vértice
+        self.neighbours[x] = self.neighbours[last]
+        self.neighbours.pop()
+        for i in range(self.n):
+            nb = self.neighbours[i]
+            if i == x or x in nb or last in nb:
+                self.neighbours[i] = _closest(g[i], i, self.n, self.k)
+
+        self.t = ArrayTour(order)
+        if affected:
+            self._rematch(affected)
+        self.cost -= repair_around(self.t, g, self.neighbours, {p, q} | affected)
+
+# Os k vértices mais próximos de i, dada a sua linha da matriz
+def _closest(row, i, n, k):
+    closest = heapq.nsmallest(min(k, n - 1) + 1, range(n), key=row.__getitem__)
+    return [j for j in closest if j != i][:k]
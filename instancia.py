@@ -34,8 +34,37 @@ def gerar_matriz(coords):
         matriz.append(linha)
     return matriz
 
+# Matriz de distâncias euclidianas calculada sob demanda a partir das
+# coordenadas, com o mesmo arredondamento de gerar_matriz. Pode ser usada no
+# lugar da matriz (g[i][j]) quando n×n valores não cabem na memória.
+class CoordinateMatrix:
+    def __init__(self, coords):
+        self.coords = coords
+
+    def __len__(self):
+        return len(self.coords)
+
+    def __getitem__(self, i):
+        return _CoordinateRow(self.coords, i)
+
+class _CoordinateRow:
+    __slots__ = ('coords', 'x', 'y')
+
+    def __init__(self, coords, i):
+        self.coords = coords
+        self.x, self.y = coords[i]
+
+    def __len__(self):
+        return len(self.coords)
+
+    def __getitem__(self, j):
+        q = self.coords[j]
+        return round(math.hypot(self.x - q[0], self.y - q[1]), 1)
+
 def salvar_matriz_formatada(matriz, nome_saida):
     with open(nome_saida, 'w') as f:
+        # Primeira linha: número de vértices, como esperado por read_graph
+        f.write(f"{len(matriz)}\n")
         for linha in matriz:
             linha_formatada = "[" + ", ".join(f"{num:.1f}" for num in linha) + "]"
             f.write(linha_formatada + "\n")
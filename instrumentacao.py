@@ -0,0 +1,106 @@
+import sys
+import json
+import time
+import cProfile
+import tracemalloc
+
+# resource não existe no Windows: o pico de RSS fica indisponível
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Estatísticas de execução por etapa: tempo em nanossegundos (medido com
+# time.perf_counter_ns), número de execuções e contadores de operações
+# (inserções e remoções no heap, vértices ímpares, arestas consideradas no
+# emparelhamento, arestas examinadas no circuito, atalhos...). Preenchido por
+# christofides(g, n, stats=...) e serializável em JSON.
+#
+# Com memory=True, cada etapa iniciada por begin() registra também o pico de
+# memória alocada durante a etapa e o saldo ao final (tracemalloc), além do
+# pico de RSS do processo até aquele ponto. O tracemalloc deixa a execução
+# bem mais lenta, por isso a medição é opcional.
+#
+# Com profile=True, cada etapa roda sob o seu próprio cProfile; os perfis
+# ficam em `profiles` (rótulo -> lista de cProfile.Profile) e são gravados e
+# resumidos pelas funções de perfil.py.
+class SolverStats:
+    def __init__(self, memory=False, profile=False):
+        # rótulo da etapa -> {'tempo_ns', 'execucoes', 'contadores'[, 'memoria']}
+        self.stages = {}
+        self.memory = memory
+        self._memory_start = None
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.profile = profile
+        self.profiles = {}
+        self._profiler = None
+
+    # Marca o início de uma etapa e devolve o instante em nanossegundos
+    def begin(self):
+        if self.memory:
+            tracemalloc.reset_peak()
+            self._memory_start = tracemalloc.get_traced_memory()[0]
+        if self.profile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return time.perf_counter_ns()
+
+    def record(self, label, elapsed_ns, counters=None):
+        if self._profiler is not None:
+            self._profiler.disable()
+            self.profiles.setdefault(label, []).append(self._profiler)
+            self._profiler = None
+
+        stage = self.stages.setdefault(
+            label, {'tempo_ns': 0, 'execucoes': 0, 'contadores': {}}
+        )
+        stage['tempo_ns'] += elapsed_ns
+        stage['execucoes'] += 1
+        for name, value in (counters or {}).items():
+            stage['contadores'][name] = stage['contadores'].get(name, 0) + value
+
+        if self._memory_start is not None:
+            current, peak = tracemalloc.get_traced_memory()
+            mem = stage.setdefault('memoria', {'pico_bytes': 0, 'saldo_bytes': 0})
+            mem['pico_bytes'] = max(mem['pico_bytes'], peak - self._memory_start)
+            mem['saldo_bytes'] += current - self._memory_start
+            mem['rss_pico_kb'] = _peak_rss_kb()
+            self._memory_start = None
+
+    def __contains__(self, label):
+        return label in self.stages
+
+    # Tempos em segundos, no formato do dicionário `tempos`
+    def tempos(self):
+        return {label: s['tempo_ns'] / 1e9 for label, s in self.stages.items()}
+
+    def as_dict(self):
+        return {
+            'etapas': self.stages,
+            'tempo_total_ns': sum(s['tempo_ns'] for s in self.stages.values()),
+        }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.as_dict(), indent=indent, ensure_ascii=False)
+
+# Pico de RSS do processo em KiB (ru_maxrss é em KiB no Linux e em bytes no macOS)
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+# Pico de memória alocada (bytes) durante func(*args), medido com tracemalloc.
+# Usado pelos benchmarks em uma execução separada, para não distorcer os tempos.
+def peak_memory(func, *args):
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1] - base
+    if not tracing:
+        tracemalloc.stop()
+    return peak
@@ -0,0 +1,94 @@
+import sys
+import heapq
+
+from christofides import prim_mst, read_graph, christofides
+
+# Limite inferior de Held-Karp para o TSP: uma 1-árvore (árvore geradora dos
+# vértices exceto o especial, mais as duas arestas mais baratas do especial)
+# com penalidades pi nos vértices. Todo ciclo é uma 1-árvore, então
+#   W(pi) = custo da 1-árvore com pesos g[u][v] + pi[u] + pi[v] - 2 * soma(pi)
+# nunca passa do ótimo. A subida de subgradiente ajusta pi para maximizar W.
+
+# Calcula a 1-árvore mínima com penalidades. Devolve (peso penalizado, graus).
+def one_tree(g, n, pi, special=0):
+    mst_edges, weight = prim_mst(g, n, pi=pi, skip=special)
+
+    deg = [0] * n
+    for u, v, _ in mst_edges:
+        deg[u] += 1
+        deg[v] += 1
+
+    # Liga o vértice especial pelas suas duas arestas mais baratas
+    row = g[special]
+    ps = pi[special]
+    cheapest = heapq.nsmallest(
+        2, ((row[v] + ps + pi[v], v) for v in range(n) if v != special)
+    )
+    for w, v in cheapest:
+        weight += w
+        deg[v] += 1
+        deg[special] += 1
+
+    return weight, deg
+
+# Subida de subgradiente (Held-Wolfe-Crowder) sobre as penalidades dos
+# vértices. `upper_bound` é o custo de um ciclo conhecido (usado no tamanho do
+# passo); sem ele, o passo usa uma estimativa 5% acima do limite atual.
+# Devolve (limite inferior, penalidades, iterações executadas).
+def held_karp_bound(g, n, upper_bound=None, max_iterations=50, patience=5):
+    if n < 3:
+        return 0.0, [0.0] * n, 0
+
+    pi = [0.0] * n
+    best_bound, best_pi = float('-inf'), pi[:]
+    lam = 2.0
+    stall = 0
+    iterations = 0
+
+    for iterations in range(1, max_iterations + 1):
+        weight, deg = one_tree(g, n, pi)
+        bound = weight - 2 * sum(pi)
+
+        if bound > best_bound + 1e-9:
+            best_bound, best_pi = bound, pi[:]
+            stall = 0
+        else:
+            stall += 1
+            if stall >= patience:
+                lam /= 2
+                stall = 0
+
+        # Todos os graus iguais a 2: a 1-árvore é um ciclo ótimo
+        norm = sum((d - 2) ** 2 for d in deg)
+        if norm == 0:
+            break
+
+        target = upper_bound if upper_bound is not None else 1.05 * best_bound
+        if target <= best_bound + 1e-9 or lam < 1e-4:
+            break
+
+        step = lam * (target - bound) / norm
+        for i in range(n):
+            pi[i] += step * (deg[i] - 2)
+
+    return best_bound, best_pi, iterations
+
+# Gap certificado: quanto o custo do ciclo está, no máximo, acima do ótimo
+def optimality_gap(tour_cost, lower_bound):
+    if lower_bound <= 0:
+        return float('inf')
+    return max(0.0, tour_cost / lower_bound - 1)
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Uso: python limite_inferior.py <graph.txt>")
+        sys.exit(1)
+
+    graph, n = read_graph(sys.argv[1])
+    _, mst_weight, _, total, _ = christofides(graph, n)
+    bound, _, iterations = held_karp_bound(graph, n, upper_bound=total)
+
+    print(f"Peso da árvore geradora mínima: {mst_weight}")
+    print(f"Limite inferior de Held-Karp: {bound:.1f} ({iterations} iterações)")
+    print(f"Peso da Solução: {total}")
+    print(f"Gap certificado: {100 * optimality_gap(total, bound):.2f}%")
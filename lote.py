@@ -0,0 +1,58 @@
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from christofides import read_graph, christofides
+from melhoria import improve_tour
+from memoria_compartilhada import InstanceRegistry, attached
+
+# Resolução em lote: muitas instâncias distribuídas em um pool de processos.
+# Cada matriz é registrada uma única vez em memória compartilhada e os
+# processos a acessam pelo descritor, sem serializar a matriz em cada tarefa.
+
+# Tarefa executada em cada processo do pool
+def _solve_shared(handle, improve):
+    n = handle.rows
+    with attached(handle) as g:
+        inicio = time.perf_counter()
+        _, _, tour, cost, tempos = christofides(g, n)
+        if improve and n > 1:
+            tour, cost = improve_tour(tour, cost, g, improve)
+        tempos['Total'] = time.perf_counter() - inicio
+        return tour, cost, tempos
+
+# Resolve muitas instâncias em paralelo. `instances` é um dicionário
+# {identificador: matriz} ou uma lista de matrizes (o identificador é o
+# índice). As maiores instâncias são despachadas primeiro, e os resultados
+# (identificador, ciclo, custo, tempos) são devolvidos à medida que terminam.
+def solve_many(instances, workers=None, improve=None):
+    if not isinstance(instances, dict):
+        instances = dict(enumerate(instances))
+
+    # Maiores primeiro: reduz o tempo ocioso no fim do lote
+    order = sorted(instances, key=lambda key: len(instances[key]), reverse=True)
+
+    with InstanceRegistry() as registry, ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for key in order:
+            handle = registry.acquire(key, instances[key])
+            futures[pool.submit(_solve_shared, handle, improve)] = key
+
+        for future in as_completed(futures):
+            key = futures[future]
+            registry.release(key)
+            tour, cost, tempos = future.result()
+            yield key, tour, cost, tempos
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python lote.py <graph.txt> [<graph.txt> ...]")
+        sys.exit(1)
+
+    try:
+        instancias = {path: read_graph(path)[0] for path in sys.argv[1:]}
+        for path, tour, cost, tempos in solve_many(instancias):
+            print(f"{path}: custo {cost:.1f} em {tempos['Total']:.3f} segundos")
+    except Exception as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        sys.exit(1)
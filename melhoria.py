@@ -0,0 +1,577 @@
+import sys
+import math
+import time
+import heapq
+from array import array
+from collections import deque
+from tour_dois_niveis import TwoLevelTour
+
+# Tolerância para considerar um movimento como melhoria
+EPS = 1e-9
+
+# Representação do ciclo em vetores tipados: a ordem dos vértices e a posição
+# de cada vértice nessa ordem. Os vértices devem ser 0..n-1.
+class ArrayTour:
+    def __init__(self, tour):
+        # Aceita o ciclo fechado (com o vértice inicial repetido no fim)
+        if len(tour) > 1 and tour[0] == tour[-1]:
+            tour = tour[:-1]
+
+        self.n = len(tour)
+        self.order = array('i', tour)
+        self.pos = array('i', [0] * self.n)
+        for i, v in enumerate(self.order):
+            self.pos[v] = i
+
+    def next(self, v):
+        i = self.pos[v] + 1
+        return self.order[0 if i == self.n else i]
+
+    def prev(self, v):
+        return self.order[self.pos[v] - 1]
+
+    # Verdadeiro se b está no caminho de a até c (no sentido direto)
+    def between(self, a, b, c):
+        pa, pb, pc = self.pos[a], self.pos[b], self.pos[c]
+        if pa <= pc:
+            return pa <= pb <= pc
+        return pb >= pa or pb <= pc
+
+    # Inverte o caminho de a até b (no sentido direto). Inverter o complemento
+    # gera o mesmo ciclo, então o lado mais curto é o invertido.
+    def reverse(self, a, b):
+        n = self.n
+        order, pos = self.order, self.pos
+        i, j = pos[a], pos[b]
+
+        length = (j - i) % n + 1
+        if 2 * length > n:
+            i, j = (j + 1) % n, (i - 1) % n
+            length = n - length
+
+        for _ in range(length // 2):
+            u = order[i]
+            v = order[j]
+            order[i] = v
+            pos[v] = i
+            order[j] = u
+            pos[u] = j
+            i += 1
+            if i == n:
+                i = 0
+            j -= 1
+            if j < 0:
+                j = n - 1
+
+    # Devolve o ciclo fechado como lista, começando em `start`
+    def to_list(self, start=None):
+        i = 0 if start is None else self.pos[start]
+        tour = list(self.order[i:]) + list(self.order[:i])
+        tour.append(tour[0])
+        return tour
+
+# A partir deste tamanho as buscas locais usam a lista de dois níveis, cuja
+# inversão custa O(√n) em vez de O(n)
+TWO_LEVEL_THRESHOLD = 1000
+
+# Cria a representação do ciclo usada pelas buscas locais
+def make_tour(tour, tour_class=None):
+    if tour_class is None:
+        n = len(tour) - 1 if len(tour) > 1 and tour[0] == tour[-1] else len(tour)
+        tour_class = TwoLevelTour if n >= TWO_LEVEL_THRESHOLD else ArrayTour
+    return tour_class(tour)
+
+# Fila com todos os vértices ativos (todos os bits "don't look" desligados)
+def _full_queue(t):
+    return deque(t.to_list()[:-1]), bytearray(b'\x01' * t.n)
+
+# Lista dos k vizinhos mais próximos de cada vértice. Com `deadline` (instante
+# de time.perf_counter), os vértices não alcançados no prazo ficam com a
+# lista vazia, e a busca local simplesmente não parte deles.
+def neighbour_lists(g, n, k=10, deadline=None):
+    k = min(k, n - 1)
+    neighbours = []
+    for i in range(n):
+        if deadline is not None and time.perf_counter() > deadline:
+            neighbours.extend([] for _ in range(n - i))
+            break
+        row = g[i]
+        closest = heapq.nsmallest(k + 1, range(n), key=row.__getitem__)
+        neighbours.append([j for j in closest if j != i][:k])
+    return neighbours
+
+# Lista dos k vizinhos mais próximos a partir das coordenadas, usando uma
+# grade espacial (cerca de 2 pontos por célula) em vez da matriz completa.
+# O lado da célula vem da maior extensão, de modo que pontos alinhados (todos
+# com o mesmo x ou o mesmo y) não geram células degeneradas. `deadline` como
+# em neighbour_lists.
+def coordinate_neighbour_lists(coords, k=10, deadline=None):
+    n = len(coords)
+    k = min(k, n - 1)
+    if k <= 0:
+        return [[] for _ in range(n)]
+
+    xs = [p[0] for p in coords]
+    ys = [p[1] for p in coords]
+    x0, y0 = min(xs), min(ys)
+    extent = max(max(xs) - x0, max(ys) - y0)
+    size = extent / math.sqrt(n / 2) or 1.0
+    gx, gy = int((max(xs) - x0) / size), int((max(ys) - y0) / size)
+
+    grid = {}
+    cell = []
+    for i, (x, y) in enumerate(coords):
+        c = (int((x - x0) / size), int((y - y0) / size))
+        grid.setdefault(c, []).append(i)
+        cell.append(c)
+
+    neighbours = []
+    for i, (x, y) in enumerate(coords):
+        if deadline is not None and i % 64 == 0 and time.perf_counter() > deadline:
+            neighbours.extend([] for _ in range(n - i))
+            break
+        cx, cy = cell[i]
+        candidates = []
+        r = 0
+        while True:
+            if r == 0:
+                ring = [(cx, cy)]
+            else:
+                ring = [(cx + dx, cy + dy) for dx in range(-r, r + 1)
+                        for dy in (-r, r)]
+                ring += [(cx + dx, cy + dy) for dx in (-r, r)
+                         for dy in range(-r + 1, r)]
+            for c in ring:
+                candidates.extend(grid.get(c, ()))
+
+            # O quadrado de raio r contém todos os pontos a até r * size; se
+            # já cobre a grade inteira, todos os pontos são candidatos
+            covers = cx - r <= 0 and cy - r <= 0 and cx + r >= gx and cy + r >= gy
+            if len(candidates) > k or covers:
+                closest = heapq.nsmallest(
+                    k + 1, candidates,
+                    key=lambda j: (xs[j] - x) ** 2 + (ys[j] - y) ** 2,
+                )
+                far = closest[-1]
+                if covers or math.hypot(xs[far] - x, ys[far] - y) <= r * size:
+                    break
+            r += 1
+
+        neighbours.append([j for j in closest if j != i][:k])
+    return neighbours
+
+# Movimento 2-opt: troca as arestas {a,b} e {c,d} por {a,c} e {b,d}, onde b
+# segue a e d segue c no mesmo sentido do ciclo (qualquer um dos dois)
+def _move(t, a, b, c, d):
+    if t.next(a) == b:
+        t.reverse(b, c)
+    else:
+        t.reverse(c, b)
+
+# Ativa um vértice (desliga o seu bit "don't look")
+def _activate(v, queue, active):
+    if not active[v]:
+        active[v] = 1
+        queue.append(v)
+
+# 2-opt com listas de vizinhos e bits "don't look". Devolve o ganho total.
+def _two_opt(t, g, neighbours, queue, active):
+    gain = 0.0
+
+    while queue:
+        a = queue.popleft()
+        active[a] = 0
+
+        improved = False
+        for succ in (t.next, t.prev):
+            b = succ(a)
+            d_ab = g[a][b]
+
+            for c in neighbours[a]:
+                # Os vizinhos estão ordenados: nenhum candidato seguinte melhora
+                g1 = d_ab - g[a][c]
+                if g1 <= EPS:
+                    break
+
+                d = succ(c)
+                if c == b or d == a:
+                    continue
+
+                delta = g[a][c] + g[b][d] - d_ab - g[c][d]
+                if delta < -EPS:
+                    _move(t, a, b, c, d)
+                    gain -= delta
+                    for v in (a, b, c, d):
+                        _activate(v, queue, active)
+                    improved = True
+                    break
+
+            if improved:
+                break
+
+    return gain
+
+# Tenta realocar um segmento de 1 a `max_segment` vértices que começa em s1,
+# inserindo-o (na ordem original ou invertido) entre dois vértices adjacentes
+# próximos. Aplica o primeiro movimento de melhoria e devolve (delta, vértices
+# afetados), ou None se nenhum movimento melhora o ciclo.
+def _or_opt_from(t, g, neighbours, s1, max_segment):
+    n = t.n
+
+    for succ, pred in ((t.next, t.prev), (t.prev, t.next)):
+        p = pred(s1)
+        seg = [s1]
+
+        while len(seg) <= max_segment and len(seg) < n - 3:
+            s2 = seg[-1]
+            nx = succ(s2)
+            if nx == p:
+                break
+
+            # Ganho de retirar o segmento, ligando p diretamente a nx
+            removed = g[p][s1] + g[s2][nx] - g[p][nx]
+
+            if removed > EPS:
+                for x in (s1, s2):
+                    for c in neighbours[x]:
+                        if g[x][c] >= removed:
+                            break
+                        if c in seg or c == p or c == nx:
+                            continue
+
+                        for e in (succ(c), pred(c)):
+                            if e in seg or e == p or e == nx:
+                                continue
+
+                            # Orienta a aresta {c, e} no mesmo sentido de p -> s1
+                            if e == succ(c):
+                                cc, ee = c, e
+                            else:
+                                cc, ee = e, c
+
+                            base = g[cc][ee] + removed
+                            forward = g[cc][s1] + g[s2][ee] - base
+                            backward = g[cc][s2] + g[s1][ee] - base
+                            delta = min(forward, backward)
+                            if delta >= -EPS:
+                                continue
+
+                            # Realocação como sequência de movimentos 2-opt:
+                            # p cc ... nx s2..s1 ee -> p nx ... cc s2..s1 ee
+                            _move(t, p, s1, cc, ee)
+                            _move(t, p, cc, nx, s2)
+                            if forward < backward and s1 != s2:
+                                # ... cc s1..s2 ee
+                                _move(t, cc, s2, s1, ee)
+
+                            return delta, (p, nx, s1, s2, cc, ee)
+
+            seg.append(nx)
+
+    return None
+
+# Or-opt com listas de vizinhos e bits "don't look", com limite opcional de
+# tempo (instante em perf_counter). Devolve o ganho total.
+def _or_opt(t, g, neighbours, queue, active, max_segment=3, deadline=None):
+    gain = 0.0
+
+    while queue:
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+
+        s1 = queue.popleft()
+        active[s1] = 0
+
+        result = _or_opt_from(t, g, neighbours, s1, max_segment)
+        if result is not None:
+            delta, touched = result
+            gain -= delta
+            for v in touched:
+                _activate(v, queue, active)
+
+    return gain
+
+# Aresta não-direcionada como tupla ordenada
+def _edge(u, v):
+    return (u, v) if u < v else (v, u)
+
+# Cadeia de Lin-Kernighan a partir do primeiro movimento (t1,t2,t3,t4): a cada
+# nível remove {t1,t2} e {t3,t4}, adiciona {t2,t3} e fecha o ciclo com {t4,t1},
+# o que equivale a um movimento 2-opt. O novo t2 passa a ser t4 e o próximo t3
+# é escolhido gulosamente entre os vizinhos. Os movimentos são aplicados
+# tentativamente e os posteriores ao melhor ganho de fechamento são desfeitos.
+# Devolve (ganho, vértices afetados); ganho 0 se a cadeia não melhora o ciclo.
+def _lk_chain(t, g, neighbours, t1, t2, t3, t4, max_depth):
+    moves = []
+    added = set()
+    G = g[t1][t2]
+    best_gain, best_len = EPS, 0
+
+    for _ in range(max_depth):
+        _move(t, t2, t1, t3, t4)
+        moves.append((t2, t1, t3, t4))
+        added.add(_edge(t2, t3))
+
+        G += g[t3][t4] - g[t2][t3]
+        gain = G - g[t4][t1]
+        if gain > best_gain:
+            best_gain, best_len = gain, len(moves)
+
+        # Próximo nível: t4 passa a ser o sucessor de t1
+        t2 = t4
+        pred = t.prev if t.next(t1) == t2 else t.next
+
+        best = None
+        for c in neighbours[t2]:
+            g1 = G - g[t2][c]
+            if g1 <= EPS:
+                break
+            if c == t1:
+                continue
+
+            d = pred(c)
+            if d == t2 or _edge(c, d) in added:
+                continue
+
+            score = g1 + g[c][d]
+            if best is None or score > best[0]:
+                best = (score, c, d)
+
+        if best is None:
+            break
+        _, t3, t4 = best
+
+    # Desfaz os movimentos posteriores ao melhor fechamento
+    while len(moves) > best_len:
+        a, b, c, d = moves.pop()
+        _move(t, a, c, b, d)
+
+    if not moves:
+        return 0.0, ()
+    return best_gain, {v for move in moves for v in move}
+
+# Tenta um movimento de Lin-Kernighan começando em t1, nos dois sentidos e com
+# até `breadth` alternativas no primeiro nível
+def _lk_from(t, g, neighbours, t1, max_depth, breadth):
+    for t2 in (t.next(t1), t.prev(t1)):
+        pred = t.prev if t.next(t1) == t2 else t.next
+        G = g[t1][t2]
+
+        candidates = []
+        for t3 in neighbours[t2]:
+            g1 = G - g[t2][t3]
+            if g1 <= EPS:
+                break
+            if t3 == t1:
+                continue
+            t4 = pred(t3)
+            if t4 == t2:
+                continue
+            candidates.append((g1 + g[t3][t4], t3, t4))
+
+        candidates.sort(reverse=True)
+        for _, t3, t4 in candidates[:breadth]:
+            gain, touched = _lk_chain(t, g, neighbours, t1, t2, t3, t4, max_depth)
+            if gain > EPS:
+                return gain, touched
+
+    return None
+
+# Lin-Kernighan com bits "don't look" e limites opcionais de tempo (instante
+# em perf_counter) e de número de tentativas. Devolve o ganho total.
+def _lin_kernighan(t, g, neighbours, queue, active, max_depth=10, breadth=5,
+                   deadline=None, max_iterations=None):
+    gain = 0.0
+    iterations = 0
+
+    while queue:
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        if max_iterations is not None and iterations >= max_iterations:
+            break
+        iterations += 1
+
+        t1 = queue.popleft()
+        active[t1] = 0
+
+        result = _lk_from(t, g, neighbours, t1, max_depth, breadth)
+        if result is not None:
+            delta, touched = result
+            gain += delta
+            for v in touched:
+                _activate(v, queue, active)
+
+    return gain
+
+# Melhora um ciclo com 2-opt até um ótimo local. O custo é mantido pelos
+# deltas dos movimentos; se não for informado, é calculado uma única vez.
+def two_opt(tour, g, cost=None, neighbours=None, k=10,
+            tour_class=None):
+    t = make_tour(tour, tour_class)
+    n = t.n
+    if cost is None:
+        cost = sum(g[tour[i]][tour[i + 1]] for i in range(len(tour) - 1))
+    if n < 5:
+        return list(tour), cost
+
+    if neighbours is None:
+        neighbours = neighbour_lists(g, n, k)
+
+    queue, active = _full_queue(t)
+    cost -= _two_opt(t, g, neighbours, queue, active)
+
+    return t.to_list(tour[0]), cost
+
+# Melhora um ciclo realocando segmentos de 1 a 3 vértices (Or-opt) até um
+# ótimo local. O custo é mantido pelos deltas dos movimentos.
+def or_opt(tour, g, cost=None, neighbours=None, k=10, max_segment=3,
+           tour_class=None):
+    t = make_tour(tour, tour_class)
+    n = t.n
+    if cost is None:
+        cost = sum(g[tour[i]][tour[i + 1]] for i in range(len(tour) - 1))
+    if n < 8:
+        return list(tour), cost
+
+    if neighbours is None:
+        neighbours = neighbour_lists(g, n, k)
+
+    queue, active = _full_queue(t)
+    cost -= _or_opt(t, g, neighbours, queue, active, max_segment)
+
+    return t.to_list(tour[0]), cost
+
+# Alterna 2-opt e Or-opt até que nenhum dos dois encontre melhoria
+def two_opt_or_opt(tour, g, cost=None, neighbours=None, k=10, max_segment=3,
+                   tour_class=None):
+    t = make_tour(tour, tour_class)
+    n = t.n
+    if cost is None:
+        cost = sum(g[tour[i]][tour[i + 1]] for i in range(len(tour) - 1))
+    if n < 8:
+        return list(tour), cost
+
+    if neighbours is None:
+        neighbours = neighbour_lists(g, n, k)
+
+    while True:
+        queue, active = _full_queue(t)
+        cost -= _two_opt(t, g, neighbours, queue, active)
+
+        queue, active = _full_queue(t)
+        gain = _or_opt(t, g, neighbours, queue, active, max_segment)
+        cost -= gain
+        if gain <= EPS:
+            break
+
+    return t.to_list(tour[0]), cost
+
+# Melhoria no estilo Lin-Kernighan: movimentos de profundidade variável (até
+# `max_depth` trocas de arestas, o que inclui os 3-opt sequenciais) alternados
+# com Or-opt até um ótimo local comum ou até esgotar os limites de tempo (em
+# segundos) ou de tentativas de movimento.
+def lin_kernighan(tour, g, cost=None, neighbours=None, k=8, max_depth=10,
+                  breadth=5, time_limit=None, max_iterations=None,
+                  tour_class=None):
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+
+    t = make_tour(tour, tour_class)
+    n = t.n
+    if cost is None:
+        cost = sum(g[tour[i]][tour[i + 1]] for i in range(len(tour) - 1))
+    if n < 8:
+        return list(tour), cost
+
+    if neighbours is None:
+        neighbours = neighbour_lists(g, n, k)
+
+    while True:
+        queue, active = _full_queue(t)
+        cost -= _lin_kernighan(t, g, neighbours, queue, active, max_depth,
+                               breadth, deadline, max_iterations)
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+
+        queue, active = _full_queue(t)
+        gain = _or_opt(t, g, neighbours, queue, active, deadline=deadline)
+        cost -= gain
+        if gain <= EPS:
+            break
+
+    return t.to_list(tour[0]), cost
+
+# Reparo local: 2-opt e Or-opt apenas a partir dos vértices informados (os
+# demais começam com o bit "don't look" ligado), alternando até que nenhum
+# dos dois melhore. Opera diretamente sobre a representação `t` do ciclo e
+# devolve o ganho total, com custo proporcional à região afetada.
+def repair_around(t, g, neighbours, vertices, max_segment=3):
+    total = 0.0
+
+    while True:
+        queue, active = deque(), bytearray(t.n)
+        for v in vertices:
+            _activate(v, queue, active)
+        total += _two_opt(t, g, neighbours, queue, active)
+
+        queue, active = deque(), bytearray(t.n)
+        for v in vertices:
+            _activate(v, queue, active)
+        gain = _or_opt(t, g, neighbours, queue, active, max_segment)
+        total += gain
+        if gain <= EPS:
+            break
+
+    return total
+
+# Métodos de melhoria disponíveis
+IMPROVEMENTS = {
+    '2opt': two_opt,
+    'oropt': or_opt,
+    '2opt+oropt': two_opt_or_opt,
+    'lk': lin_kernighan,
+}
+
+# Aplica o método de melhoria escolhido ao ciclo produzido por christofides()
+def improve_tour(tour, cost, g, method, **options):
+    if method not in IMPROVEMENTS:
+        raise ValueError(f"Método de melhoria desconhecido: {method}")
+    return IMPROVEMENTS[method](tour, g, cost=cost, **options)
+
+# Ótimos publicados na TSPLIB para as instâncias incluídas no repositório.
+# bayg29 e si175 são matrizes explícitas de inteiros (ótimo exato). As demais
+# foram geradas por instancia.py com distâncias euclidianas arredondadas a 0.1
+# (a TSPLIB arredonda para inteiros), então o gap é aproximado em ~0.5%; para
+# att48 usa-se o ótimo euclidiano (a TSPLIB usa a distância pseudo-euclidiana ATT).
+KNOWN_OPTIMA = {
+    'att48': 33523.7,
+    'bayg29': 1610,
+    'bier127': 118282,
+    'a280': 2579,
+    'pr299': 48191,
+    'si175': 21407,
+}
+
+# Relatório de gap em relação aos ótimos conhecidos, antes e depois da melhoria
+def gap_report(method='lk', instances=None, out=sys.stdout, **options):
+    from christofides import read_graph, christofides
+
+    if instances is None:
+        instances = list(KNOWN_OPTIMA)
+
+    print(f"{'Instância':<10} {'Ótimo':>10} {'Christofides':>13} {'Gap':>7} "
+          f"{method:>12} {'Gap':>7} {'Tempo':>8}", file=out)
+    for name in instances:
+        g, n = read_graph(f"{name}.txt")
+        _, _, tour, cost, _ = christofides(g, n)
+
+        inicio = time.perf_counter()
+        _, improved = improve_tour(tour, cost, g, method, **options)
+        tempo = time.perf_counter() - inicio
+
+        optimum = KNOWN_OPTIMA[name]
+        print(f"{name:<10} {optimum:>10} {cost:>13.1f} "
+              f"{100 * (cost / optimum - 1):>6.2f}% {improved:>12.1f} "
+              f"{100 * (improved / optimum - 1):>6.2f}% {tempo:>7.3f}s", file=out)
+
+if __name__ == "__main__":
+    gap_report(sys.argv[1] if len(sys.argv) > 1 else 'lk')
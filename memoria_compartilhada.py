@@ -0,0 +1,92 @@
+from array import array
+from collections import namedtuple
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+# Registro de instâncias em memória compartilhada. Uma matriz (n×n) ou um
+# conjunto de coordenadas (n×2) é copiado uma única vez para um segmento
+# nomeado; os processos recebem apenas o descritor e acessam os dados por
+# visões somente leitura, sem cópia. Cada job adquire uma referência e o
+# segmento é liberado quando a última referência é devolvida.
+
+# Descritor enviado aos processos: nome do segmento e dimensões
+SharedInstance = namedtuple('SharedInstance', ['name', 'rows', 'cols'])
+
+class InstanceRegistry:
+    def __init__(self):
+        # chave -> [segmento, descritor, referências]
+        self._entries = {}
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    # Registra a instância (se ainda não estiver registrada) e adquire uma
+    # referência. `data` é uma lista de linhas: a matriz ou as coordenadas.
+    def acquire(self, key, data):
+        entry = self._entries.get(key)
+        if entry is None:
+            rows = len(data)
+            cols = len(data[0]) if rows else 0
+            shm = shared_memory.SharedMemory(create=True, size=max(1, 8 * rows * cols))
+            flat = shm.buf.cast('d')
+            for i, row in enumerate(data):
+                flat[i * cols:(i + 1) * cols] = array('d', row)
+            flat.release()
+
+            entry = [shm, SharedInstance(shm.name, rows, cols), 0]
+            self._entries[key] = entry
+
+        entry[2] += 1
+        return entry[1]
+
+    # Devolve uma referência; a última libera o segmento
+    def release(self, key):
+        entry = self._entries[key]
+        entry[2] -= 1
+        if entry[2] == 0:
+            del self._entries[key]
+            entry[0].close()
+            entry[0].unlink()
+
+    # Libera todos os segmentos, independentemente das referências
+    def close(self):
+        for shm, _, _ in self._entries.values():
+            shm.close()
+            shm.unlink()
+        self._entries.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Abre um segmento pelo descritor e devolve (segmento, visão plana, linhas).
+# As linhas são visões somente leitura (data[u][v] funciona como na lista),
+# exceto com writable=True, usado por quem atualiza partes disjuntas da matriz.
+def open_view(handle, writable=False):
+    shm = shared_memory.SharedMemory(name=handle.name)
+    buf = shm.buf if writable else shm.buf.toreadonly()
+    flat = buf.cast('d')
+    cols = handle.cols
+    rows = [flat[i * cols:(i + 1) * cols] for i in range(handle.rows)]
+    return shm, flat, rows
+
+# Libera as visões e fecha o segmento (sem removê-lo)
+def close_view(shm, flat, rows):
+    for row in rows:
+        row.release()
+    flat.release()
+    shm.close()
+
+# Acesso temporário a uma instância compartilhada dentro de um processo
+@contextmanager
+def attached(handle):
+    shm, flat, rows = open_view(handle)
+    try:
+        yield rows
+    finally:
+        close_view(shm, flat, rows)
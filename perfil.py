@@ -0,0 +1,94 @@
+import os
+import sys
+import pstats
+
+# Relatórios do perfil por etapa coletado por SolverStats(profile=True): cada
+# etapa do pipeline roda sob o seu próprio cProfile, de modo que as funções
+# mais custosas são agrupadas pela etapa em que foram chamadas.
+#
+#   <prefixo>.pstats     todas as etapas combinadas (pstats / snakeviz)
+#   <prefixo>.collapsed  pilhas colapsadas "etapa;função;...;função valor",
+#                        em microssegundos, para flamegraph.pl / speedscope
+
+# Nome legível de uma função do pstats: arquivo:linha(função)
+def _label(func):
+    filename, line, name = func
+    if filename == '~':
+        return name
+    return f"{os.path.basename(filename)}:{line}({name})"
+
+def _stats(profiles):
+    stats = pstats.Stats(profiles[0])
+    for profile in profiles[1:]:
+        stats.add(profile)
+    return stats
+
+# Pilhas colapsadas de uma etapa. O cProfile só guarda as arestas
+# chamador -> chamado; o tempo próprio de cada função é repartido entre os
+# caminhos a partir das raízes na proporção do tempo acumulado em cada aresta.
+def _collapsed_stacks(stage, stats, max_depth=64):
+    entries = stats.stats
+    callees = {}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    roots = [f for f, (_, _, _, _, callers) in entries.items()
+             if not any(c in entries for c in callers)]
+
+    lines = {}
+
+    def visit(func, stack, fraction):
+        _, _, tt, ct, _ = entries[func]
+        stack = stack + [_label(func)]
+        value = int(round(tt * fraction * 1e6))
+        if value > 0:
+            key = ";".join(stack)
+            lines[key] = lines.get(key, 0) + value
+        if len(stack) >= max_depth:
+            return
+        for callee, edge_ct in callees.get(func, ()):
+            callee_ct = entries[callee][3]
+            if callee_ct <= 0 or _label(callee) in stack:
+                continue
+            visit(callee, stack, fraction * min(1.0, edge_ct / callee_ct))
+
+    for root in roots:
+        visit(root, [stage], 1.0)
+    return lines
+
+# Grava <prefixo>.pstats e <prefixo>.collapsed. Devolve os caminhos.
+def save_profile(profiles, prefix):
+    all_profiles = [p for stage in profiles.values() for p in stage]
+    if not all_profiles:
+        return []
+
+    pstats_path = f"{prefix}.pstats"
+    _stats(all_profiles).dump_stats(pstats_path)
+
+    collapsed_path = f"{prefix}.collapsed"
+    with open(collapsed_path, 'w') as f:
+        for stage, stage_profiles in profiles.items():
+            # ';' e espaço separam os quadros e o valor no formato colapsado
+            name = stage.replace(';', ',').replace(' ', '_')
+            for stack, value in _collapsed_stacks(name, _stats(stage_profiles)).items():
+                f.write(f"{stack} {value}\n")
+    return [pstats_path, collapsed_path]
+
+# Funções com maior tempo próprio em cada etapa
+def hot_functions(profiles, top=5):
+    report = {}
+    for stage, stage_profiles in profiles.items():
+        entries = _stats(stage_profiles).stats
+        ranked = sorted(entries.items(), key=lambda item: item[1][2], reverse=True)
+        report[stage] = [
+            (_label(func), nc, tt, ct) for func, (_, nc, tt, ct, _) in ranked[:top]
+        ]
+    return report
+
+def print_hot_functions(profiles, top=5, out=sys.stdout):
+    print("\nFunções mais custosas por etapa (tempo próprio / acumulado):", file=out)
+    for stage, rows in hot_functions(profiles, top).items():
+        print(f"{stage}:", file=out)
+        for label, calls, tt, ct in rows:
+            print(f"  {tt:>9.4f}s {ct:>9.4f}s {calls:>9}  {label}", file=out)
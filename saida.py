@@ -0,0 +1,86 @@
+import os
+import json
+import struct
+from array import array
+
+# Gravação do resultado em arquivo, em vez de imprimir as listas do Python:
+#
+#   jsonl  uma linha JSON por execução (acrescentada ao arquivo), com instância,
+#          custo, ciclo e tempos
+#   tour   arquivo TSPLIB .tour (vértices numerados a partir de 1)
+#   bin    binário compacto: cabeçalho (assinatura, n, custo) seguido dos n
+#          vértices em int32, gravado com uma única escrita
+#
+# O ciclo é recebido fechado (primeiro vértice repetido no fim), como devolvido
+# por christofides(); os arquivos guardam apenas os n vértices.
+
+OUTPUT_FORMATS = ('jsonl', 'tour', 'bin')
+
+# Assinatura, versão, n (uint32) e custo (float64), em little-endian
+_MAGIC = b'CHTR'
+_HEADER = struct.Struct('<4sHId')
+_VERSION = 1
+
+# Formato deduzido pela extensão do arquivo
+def output_format(path):
+    ext = os.path.splitext(path)[1].lower().lstrip('.')
+    if ext in ('jsonl', 'json'):
+        return 'jsonl'
+    if ext in OUTPUT_FORMATS:
+        return ext
+    raise ValueError(f"Formato de saída desconhecido para '{path}' "
+                     f"(use .jsonl, .tour ou .bin ou informe --output-format)")
+
+def _open_tour(tour):
+    return tour[:-1] if len(tour) > 1 and tour[0] == tour[-1] else tour
+
+def write_jsonl(path, tour, cost, name=None, tempos=None):
+    record = {'instancia': name, 'n': len(_open_tour(tour)), 'cost': cost,
+              'tour': _open_tour(tour), 'tempos': tempos or {}}
+    with open(path, 'a') as f:
+        f.write(json.dumps(record, separators=(',', ':')) + "\n")
+
+def write_tsplib_tour(path, tour, cost, name=None):
+    vertices = _open_tour(tour)
+    name = os.path.splitext(os.path.basename(name or path))[0]
+    lines = [
+        f"NAME : {name}",
+        f"COMMENT : custo {cost}",
+        "TYPE : TOUR",
+        f"DIMENSION : {len(vertices)}",
+        "TOUR_SECTION",
+    ]
+    lines.extend(str(v + 1) for v in vertices)
+    lines += ["-1", "EOF", ""]
+    with open(path, 'w') as f:
+        f.write("\n".join(lines))
+
+def write_binary_tour(path, tour, cost):
+    vertices = array('i', _open_tour(tour))
+    data = _HEADER.pack(_MAGIC, _VERSION, len(vertices), cost) + vertices.tobytes()
+    with open(path, 'wb') as f:
+        f.write(data)
+
+# Lê um ciclo gravado por write_binary_tour. Devolve (ciclo fechado, custo).
+def read_binary_tour(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, n, cost = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"'{path}' não é um ciclo binário válido")
+    vertices = array('i')
+    vertices.frombytes(data[_HEADER.size:_HEADER.size + 4 * n])
+    tour = vertices.tolist()
+    return tour + tour[:1], cost
+
+# Grava o resultado no formato escolhido (ou deduzido pela extensão)
+def write_result(path, tour, cost, fmt=None, name=None, tempos=None):
+    fmt = fmt or output_format(path)
+    if fmt == 'jsonl':
+        write_jsonl(path, tour, cost, name=name, tempos=tempos)
+    elif fmt == 'tour':
+        write_tsplib_tour(path, tour, cost, name=name)
+    elif fmt == 'bin':
+        write_binary_tour(path, tour, cost)
+    else:
+        raise ValueError(f"Formato de saída desconhecido: {fmt}")
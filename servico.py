@@ -0,0 +1,365 @@
+import sys
+import json
+import time
+import uuid
+import asyncio
+import argparse
+from array import array
+from urllib.parse import urlsplit, parse_qs
+from concurrent.futures import ProcessPoolExecutor
+
+from christofides import christofides, solve, read_graph
+from melhoria import IMPROVEMENTS, improve_tour
+from instancia import gerar_matriz
+from memoria_compartilhada import InstanceRegistry, attached
+from cache_resultados import ResultCache, instance_key, file_key
+
+# Serviço HTTP/JSON local: recebe matrizes ou coordenadas, enfileira os jobs
+# e os executa em um pool de processos mantido aquecido (interpretador e
+# networkx já carregados), evitando a inicialização a cada requisição. As
+# matrizes ficam no registro de memória compartilhada: jobs simultâneos sobre a
+# mesma instância compartilham um único segmento.
+#
+#   POST   /solve        corpo JSON {"matrix": [[...]]} ou {"coords": [[x, y], ...]},
+#                        com opções "id", "improve", "deadline" (segundos) e
+#                        "instance" (identificador estável da instância, usado
+#                        como chave do cache em vez do hash da matriz);
+#                        ou corpo binário (application/octet-stream) com a
+#                        matriz n×n em float64 e as opções na query string
+#   DELETE /jobs/<id>    cancela um job ainda na fila (jobs já em execução no
+#                        pool não podem ser cancelados: 409)
+#   GET    /health       tamanho da fila e número de processos
+#
+# Também oferece o modo worker (christofides.py --worker), que processa jobs
+# em JSON lines pela entrada padrão.
+
+# Processo do pool: executa um job e devolve o resultado com os tempos
+def _solve_job(handle, options):
+    with attached(handle) as g:
+        return _solve(g, handle.rows, options)
+
+def _solve(g, n, options):
+    inicio = time.perf_counter()
+
+    if options.get('deadline') is not None:
+        tour, cost, tempos = solve(g, n, deadline=options['deadline'])
+    else:
+        _, _, tour, cost, tempos = christofides(g, n)
+        improve = options.get('improve')
+        if improve and n > 1:
+            inicio_melhoria = time.perf_counter()
+            tour, cost = improve_tour(tour, cost, g, improve)
+            tempos[f'Melhoria ({improve})'] = time.perf_counter() - inicio_melhoria
+
+    tempos['Resolução'] = time.perf_counter() - inicio
+    return {'tour': tour, 'cost': cost, 'tempos': tempos}
+
+# Executado uma vez em cada processo do pool apenas para carregá-lo
+def _warm_up():
+    return True
+
+class SolverService:
+    def __init__(self, workers=None, max_queue=1000, cache=None):
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.workers = self.pool._max_workers
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.jobs = {}
+        self.running = set()
+        self.registry = InstanceRegistry()
+        self.cache = cache if cache is not None else ResultCache()
+
+    async def start(self, host, port):
+        loop = asyncio.get_running_loop()
+        # Sobe todos os processos antes da primeira requisição
+        await asyncio.gather(*(
+            loop.run_in_executor(self.pool, _warm_up) for _ in range(self.workers)
+        ))
+        self.dispatchers = [
+            asyncio.create_task(self._dispatch()) for _ in range(self.workers)
+        ]
+        return await asyncio.start_server(self._handle, host, port)
+
+    # Retira jobs da fila e os executa no pool (um por processo). A referência
+    # ao segmento de memória compartilhada só é liberada aqui, depois que o
+    # processo do pool terminou de usá-lo (ou o job saiu da fila sem rodar).
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job_id, key, handle, options, future, enqueued = await self.queue.get()
+            try:
+                # Job cancelado enquanto aguardava na fila
+                if future.done():
+                    continue
+
+                espera = time.perf_counter() - enqueued
+                if options.get('deadline') is not None:
+                    options['deadline'] -= espera
+                    if options['deadline'] <= 0:
+                        future.set_exception(TimeoutError("prazo esgotado na fila"))
+                        continue
+
+                self.running.add(job_id)
+                result = await loop.run_in_executor(self.pool, _solve_job, handle, options)
+                result['tempos']['Fila'] = espera
+                if not future.done():
+                    future.set_result(result)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self.running.discard(job_id)
+                self.registry.release(key)
+                self.queue.task_done()
+
+    async def _handle(self, reader, writer):
+        try:
+            method, target, headers, body = await _read_request(reader)
+            status, payload = await self._route(method, target, headers, body)
+        except ValueError as e:
+            status, payload = 400, {'erro': str(e)}
+        except Exception as e:
+            status, payload = 500, {'erro': str(e)}
+
+        data = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            "Connection: close\r\n\r\n".encode() + data
+        )
+        await writer.drain()
+        writer.close()
+
+    async def _route(self, method, target, headers, body):
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        if method == 'GET' and url.path == '/health':
+            return 200, {'fila': self.queue.qsize(), 'workers': self.workers,
+                         'cache': self.cache.stats()}
+
+        if method == 'DELETE' and url.path.startswith('/jobs/'):
+            job_id = url.path[len('/jobs/'):]
+            if job_id not in self.jobs:
+                return 404, {'erro': f"job desconhecido: {job_id}"}
+            if job_id in self.running:
+                return 409, {'id': job_id, 'erro': "job em execução não pode ser cancelado"}
+            self.jobs[job_id].cancel()
+            return 200, {'id': job_id, 'cancelado': True}
+
+        if method == 'POST' and url.path == '/solve':
+            inicio = time.perf_counter()
+            g, options = _parse_job(headers, body, query)
+            job_id = options.pop('id', None) or uuid.uuid4().hex
+            leitura = time.perf_counter() - inicio
+            return await self._submit(job_id, g, options, leitura)
+
+        return 404, {'erro': f"rota desconhecida: {method} {url.path}"}
+
+    async def _submit(self, job_id, g, options, leitura):
+        if job_id in self.jobs:
+            return 409, {'erro': f"job já existe: {job_id}"}
+
+        # Consulta o cache de resultados antes de enfileirar
+        inicio = time.perf_counter()
+        key = _instance_id(g, options)
+        cache_key = self.cache.key(g, options, instance=key)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return 200, {
+                'tour': list(cached[0]), 'cost': cached[1], 'id': job_id,
+                'tempos': {'Leitura': leitura, 'Cache': time.perf_counter() - inicio},
+            }
+
+        if self.queue.full():
+            return 503, {'erro': "fila cheia"}
+
+        handle = self.registry.acquire(key, g)
+        future = asyncio.get_running_loop().create_future()
+        self.jobs[job_id] = future
+        await self.queue.put((job_id, key, handle, options, future, time.perf_counter()))
+
+        try:
+            result = await future
+        except asyncio.CancelledError:
+            return 409, {'id': job_id, 'erro': "cancelado"}
+        except TimeoutError as e:
+            return 504, {'id': job_id, 'erro': str(e)}
+        finally:
+            self.jobs.pop(job_id, None)
+
+        self.cache.put(cache_key, (result['tour'], result['cost']))
+        result['id'] = job_id
+        result['tempos']['Leitura'] = leitura
+        return 200, result
+
+_REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 409: 'Conflict',
+    500: 'Internal Server Error', 503: 'Service Unavailable', 504: 'Gateway Timeout',
+}
+
+# Lê uma requisição HTTP/1.1 simples (com Content-Length)
+async def _read_request(reader):
+    request_line = (await reader.readline()).decode('latin-1').strip()
+    if not request_line:
+        raise ValueError("Requisição vazia")
+    method, target, _ = request_line.split(' ', 2)
+
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode('latin-1').strip()
+        if not line:
+            break
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get('content-length', 0))
+    body = await reader.readexactly(length) if length else b''
+    return method, target, headers, body
+
+# Converte o corpo da requisição em (matriz, opções)
+def _parse_job(headers, body, query):
+    if headers.get('content-type', '').startswith('application/octet-stream'):
+        values = array('d')
+        values.frombytes(body)
+        n = int(round(len(values) ** 0.5))
+        if n * n != len(values):
+            raise ValueError("Corpo binário deve conter n×n valores float64")
+        g = [values[i * n:(i + 1) * n].tolist() for i in range(n)]
+        options = dict(query)
+    else:
+        data = json.loads(body or b'{}')
+        if 'matrix' in data:
+            g = [[float(x) for x in row] for row in data['matrix']]
+        elif 'coords' in data:
+            g = gerar_matriz([(float(x), float(y)) for x, y in data['coords']])
+        else:
+            raise ValueError("Informe 'matrix' ou 'coords'")
+        options = {k: v for k, v in data.items() if k not in ('matrix', 'coords')}
+        options.update(query)
+
+    n = len(g)
+    if n == 0 or any(len(row) != n for row in g):
+        raise ValueError("A matriz deve ser quadrada e não vazia")
+    return g, _parse_options(options)
+
+# Valida as opções de um job (comuns a todas as formas de entrada)
+def _parse_options(options):
+    if options.get('improve') and options['improve'] not in IMPROVEMENTS:
+        raise ValueError(f"Método de melhoria desconhecido: {options['improve']}")
+    if options.get('deadline') is not None:
+        options['deadline'] = float(options['deadline'])
+    return options
+
+# Identificador da instância para o cache e o registro: o "instance" informado
+# pelo cliente (retirado das opções) ou, sem ele, o hash da matriz
+def _instance_id(g, options):
+    instance = options.pop('instance', None)
+    return instance_key(g) if instance is None else f"cliente:{instance}"
+
+# Cache das instâncias lidas de arquivo no modo worker, invalidado quando o
+# arquivo é modificado. Devolve (matriz, file_key do arquivo); a mesma chave
+# identifica a instância no cache de resultados, sem percorrer a matriz.
+_instance_cache = {}
+_INSTANCE_CACHE_SIZE = 32
+
+def _cached_graph(path):
+    key = file_key(path)
+    cached = _instance_cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1], key
+
+    g, _ = read_graph(path)
+    if len(_instance_cache) >= _INSTANCE_CACHE_SIZE:
+        _instance_cache.pop(next(iter(_instance_cache)))
+    _instance_cache[path] = (key, g)
+    return g, key
+
+# Modo worker: lê jobs em JSON lines da entrada e escreve um resultado JSON por
+# linha na saída, mantendo o processo (imports e caches) aquecido entre jobs.
+# Cada job tem "path" (arquivo de matriz), "matrix" ou "coords", e as opções
+# "id", "improve", "deadline" e "instance". Um job com erro gera {"id": ..., "erro": ...}
+# sem interromper os seguintes. Jobs repetidos são atendidos pelo cache de
+# resultados; o job {"stats": true} devolve as métricas do cache.
+def worker_loop(stdin=sys.stdin, stdout=sys.stdout, cache=None):
+    if cache is None:
+        cache = ResultCache()
+
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        job_id = None
+        try:
+            inicio = time.perf_counter()
+            data = json.loads(line)
+            job_id = data.get('id')
+            if data.get('stats'):
+                stdout.write(json.dumps({'id': job_id, 'cache': cache.stats()}) + "\n")
+                stdout.flush()
+                continue
+
+            if 'path' in data:
+                g, instance = _cached_graph(data['path'])
+                options = _parse_options(
+                    {k: v for k, v in data.items() if k not in ('path', 'id')}
+                )
+                if 'instance' in options:
+                    instance = _instance_id(g, options)
+            else:
+                g, options = _parse_job({}, line.encode(), {})
+                options.pop('id', None)
+                instance = _instance_id(g, options)
+            leitura = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            cache_key = cache.key(g, options, instance=instance)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                result = {'tour': list(cached[0]), 'cost': cached[1],
+                          'tempos': {'Cache': time.perf_counter() - inicio}}
+            else:
+                result = _solve(g, len(g), options)
+                cache.put(cache_key, (result['tour'], result['cost']))
+            result['tempos']['Leitura'] = leitura
+            result = {'id': job_id, **result}
+        except Exception as e:
+            result = {'id': job_id, 'erro': str(e)}
+
+        stdout.write(json.dumps(result) + "\n")
+        stdout.flush()
+
+async def _serve(host, port, workers, cache):
+    service = SolverService(workers=workers, cache=cache)
+    server = await service.start(host, port)
+    print(f"Servindo em http://{host}:{port} com {service.workers} processos")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.registry.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="christofides.py serve",
+        description="Serviço HTTP/JSON do algoritmo de Christofides",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processos do pool (padrão: número de CPUs)")
+    parser.add_argument("--cache-size", type=int, default=128,
+                        help="resultados mantidos no cache em memória (padrão: 128)")
+    parser.add_argument("--cache-dir",
+                        help="diretório do cache de resultados em disco")
+    args = parser.parse_args(argv)
+
+    cache = ResultCache(maxsize=args.cache_size, directory=args.cache_dir)
+    try:
+        asyncio.run(_serve(args.host, args.port, args.workers, cache))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,187 @@
+import math
+from array import array
+
+# Representação do ciclo em lista de dois níveis: os vértices ficam divididos
+# em segmentos de ~√n vértices, cada um com um bit de inversão, e os segmentos
+# ficam em uma lista ordenada (o nível superior). Inverter um caminho custa
+# O(√n): no máximo dois segmentos são divididos e a sequência de segmentos
+# entre eles é invertida apenas trocando a ordem e os bits de inversão.
+# Oferece a mesma interface de melhoria.ArrayTour (next, prev, between,
+# reverse, to_list), então pode ser usada pelas buscas locais.
+#
+# Todos os vértices ficam em um único array('i') (`buf`); o segmento s ocupa
+# buf[start[s]:start[s] + size[s]] e pos[v] é a posição de v em `buf`. Dividir
+# um segmento não move vértices: a cauda passa a ser um novo segmento sobre a
+# mesma faixa de `buf`.
+class TwoLevelTour:
+    def __init__(self, tour):
+        # Aceita o ciclo fechado (com o vértice inicial repetido no fim)
+        if len(tour) > 1 and tour[0] == tour[-1]:
+            tour = tour[:-1]
+
+        self.n = len(tour)
+        self.group = max(8, int(math.sqrt(self.n)))
+        # Vértice -> segmento e posição em `buf`
+        self.seg_of = array('i', [0] * self.n)
+        self.pos = array('i', [0] * self.n)
+        self._build(tour)
+
+    # (Re)constrói os segmentos a partir da ordem dos vértices
+    def _build(self, order):
+        self.buf = array('i', order)
+        self.start = array('i')
+        self.size = array('i')
+        self.rev = bytearray()
+        self.rank = array('i')
+        self.segs = array('i')
+
+        for p, v in enumerate(self.buf):
+            self.pos[v] = p
+        for lo in range(0, len(self.buf), self.group):
+            self._new_segment(lo, min(self.group, len(self.buf) - lo))
+
+    def _new_segment(self, lo, size):
+        s = len(self.start)
+        self.start.append(lo)
+        self.size.append(size)
+        self.rev.append(0)
+        self.rank.append(len(self.segs))
+        self.segs.append(s)
+        buf, seg_of = self.buf, self.seg_of
+        for p in range(lo, lo + size):
+            seg_of[buf[p]] = s
+        return s
+
+    # Primeiro e último vértices de um segmento no sentido do ciclo
+    def _first(self, s):
+        if self.rev[s]:
+            return self.buf[self.start[s] + self.size[s] - 1]
+        return self.buf[self.start[s]]
+
+    def _last(self, s):
+        if self.rev[s]:
+            return self.buf[self.start[s]]
+        return self.buf[self.start[s] + self.size[s] - 1]
+
+    def next(self, v):
+        s = self.seg_of[v]
+        p = self.pos[v]
+        if self.rev[s]:
+            if p != self.start[s]:
+                return self.buf[p - 1]
+        elif p - self.start[s] + 1 != self.size[s]:
+            return self.buf[p + 1]
+        r = self.rank[s] + 1
+        return self._first(self.segs[0 if r == len(self.segs) else r])
+
+    def prev(self, v):
+        s = self.seg_of[v]
+        p = self.pos[v]
+        if self.rev[s]:
+            if p - self.start[s] + 1 != self.size[s]:
+                return self.buf[p + 1]
+        elif p != self.start[s]:
+            return self.buf[p - 1]
+        return self._last(self.segs[self.rank[s] - 1])
+
+    # Posição global de um vértice, comparável entre vértices
+    def _key(self, v):
+        s = self.seg_of[v]
+        i = self.pos[v] - self.start[s]
+        if self.rev[s]:
+            i = self.size[s] - 1 - i
+        return self.rank[s], i
+
+    # Verdadeiro se b está no caminho de a até c (no sentido direto)
+    def between(self, a, b, c):
+        ka, kb, kc = self._key(a), self._key(b), self._key(c)
+        if ka <= kc:
+            return ka <= kb <= kc
+        return kb >= ka or kb <= kc
+
+    # Inverte buf[i..j] no lugar, atualizando as posições
+    def _reverse_range(self, i, j):
+        buf, pos = self.buf, self.pos
+        buf[i:j + 1] = buf[i:j + 1][::-1]
+        for p in range(i, j + 1):
+            pos[buf[p]] = p
+
+    # Divide o segmento de v para que v seja o primeiro vértice de um segmento
+    def _split_before(self, v):
+        s = self.seg_of[v]
+        if self._first(s) == v:
+            return
+
+        # Normaliza o segmento para o sentido direto antes de dividir
+        lo = self.start[s]
+        if self.rev[s]:
+            self._reverse_range(lo, lo + self.size[s] - 1)
+            self.rev[s] = 0
+
+        i = self.pos[v] - lo
+        tail = self.size[s] - i
+        self.size[s] = i
+        t = self._new_segment(lo + i, tail)
+
+        # _new_segment acrescenta t ao fim da ordem: move-o para depois de s
+        self.segs.pop()
+        r = self.rank[s] + 1
+        self.segs.insert(r, t)
+        for q in range(r, len(self.segs)):
+            self.rank[self.segs[q]] = q
+
+    # Inverte o caminho de a até b (no sentido direto). Inverter o complemento
+    # gera o mesmo ciclo, então a sequência de segmentos mais curta é invertida.
+    def reverse(self, a, b):
+        if a == b:
+            return
+
+        # Caminho dentro de um único segmento: troca direta
+        sa, sb = self.seg_of[a], self.seg_of[b]
+        if sa == sb and self._key(a) <= self._key(b):
+            i, j = self.pos[a], self.pos[b]
+            self._reverse_range(min(i, j), max(i, j))
+            return
+
+        after = self.next(b)
+        if after == a:
+            # O caminho é o ciclo inteiro: inverter não altera o ciclo
+            return
+
+        self._split_before(a)
+        self._split_before(after)
+
+        ra = self.rank[self.seg_of[a]]
+        rb = self.rank[self.seg_of[b]]
+        m = len(self.segs)
+        if (rb - ra) % m + 1 > m // 2:
+            # Inverte o complemento, de `after` até o antecessor de a
+            ra, rb = self.rank[self.seg_of[after]], ra - 1
+
+        # Sequência de segmentos (circular) de ra até rb
+        count = (rb - ra) % m + 1
+        positions = [(ra + q) % m for q in range(count)]
+        chosen = [self.segs[p] for p in positions]
+        chosen.reverse()
+        for p, s in zip(positions, chosen):
+            self.segs[p] = s
+            self.rank[s] = p
+            self.rev[s] ^= 1
+
+        # Muitos segmentos pequenos tornam as operações lentas: reconstrói
+        if len(self.segs) > 4 * (self.n // self.group + 1):
+            self._build(self.to_list()[:-1])
+
+    # Devolve o ciclo fechado como lista, começando em `start`
+    def to_list(self, start=None):
+        order = []
+        buf = self.buf
+        for s in self.segs:
+            c = buf[self.start[s]:self.start[s] + self.size[s]]
+            order.extend(reversed(c) if self.rev[s] else c)
+
+        if start is not None:
+            i = order.index(start)
+            order = order[i:] + order[:i]
+        order.append(order[0])
+        return order